@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import signal
+import string
 import subprocess
-from dataclasses import dataclass
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ALL_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from functools import cached_property, lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
 
-from .footer import AgentFooter, parse_footer
+from .footer import AgentFooter, read_footer
+from .util import json_bytes
 
 
 DEFAULT_PROMPT = """You are a Cursor headless coding agent.
@@ -48,40 +59,401 @@ Additional notes:
 """
 
 
+_READ_CHUNK = 1 << 16
+_TRANSCRIPT_BUFFER = 1 << 16
+
+
+@dataclass(slots=True)
+class PromptVars:
+    """Values substituted into the agent prompt template."""
+
+    ticket_key: str
+    title: str
+    description: str
+    acceptance: str
+    repo_path: str
+    base_branch: str
+    deny_globs: str
+    max_files: str
+    max_lines: str
+    test_command: str
+    format_command: str
+    do_not_touch: str
+    notes_for_agent: str = ""
+
+
 @dataclass
 class AgentResult:
     exit_code: int
-    footer: Optional[AgentFooter]
-    transcript: str
+    transcript_path: Path
+    transcript_length: int
+
+    @cached_property
+    def footer(self) -> Optional[AgentFooter]:
+        """Footer parsed from the transcript on first access."""
+        return read_footer(self.transcript_path)
+
+
+@dataclass
+class AgentSpec:
+    """Arguments for one ``run_agent`` invocation, used by ``gather_agents``."""
+
+    command: str
+    repo_path: Path
+    prompt_vars: PromptVars
+    timeout_minutes: int
+    transcript_path: Path
+    prompt_template_path: Optional[str] = None
+    prompt_flag: str = "--print"
+
+
+_CONVERSIONS = {"s": str, "r": repr, "a": ascii}
+
+
+@lru_cache(maxsize=32)
+def _load_template(path: str, mtime_ns: int) -> str:
+    # mtime_ns is part of the cache key so edits to the template are picked up.
+    return Path(path).read_text()
+
+
+@lru_cache(maxsize=32)
+def _make_renderer(template: str) -> Callable[[PromptVars], str]:
+    """Compile *template* once into a function rendering ``PromptVars``.
+
+    Templates using positional or attribute/index fields fall back to
+    ``str.format`` so their output is unchanged.
+    """
+    parts = tuple(string.Formatter().parse(template))
+    if any(field is not None and not field.isidentifier() for _, field, _, _ in parts):
+        return lambda prompt_vars: template.format(**asdict(prompt_vars))
+
+    steps = tuple(
+        (literal, attrgetter(field) if field is not None else None, spec, _CONVERSIONS.get(conversion or ""))
+        for literal, field, spec, conversion in parts
+    )
+
+    def render(prompt_vars: PromptVars) -> str:
+        out: List[str] = []
+        for literal, getter, spec, convert in steps:
+            if literal:
+                out.append(literal)
+            if getter is None:
+                continue
+            value = getter(prompt_vars)
+            if convert:
+                value = convert(value)
+            out.append(format(value, spec) if spec else str(value))
+        return "".join(out)
+
+    return render
+
+
+def _render_prompt(prompt_vars: PromptVars, prompt_template_path: Optional[str]) -> str:
+    if prompt_template_path:
+        prompt_template = _load_template(prompt_template_path, os.stat(prompt_template_path).st_mtime_ns)
+    else:
+        prompt_template = DEFAULT_PROMPT
+    return _make_renderer(prompt_template)(prompt_vars)
+
+
+_KILL_GRACE_SECONDS = 5
+
+
+def _kill_group(pid: int, sig: int = signal.SIGTERM) -> None:
+    try:
+        os.killpg(pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+async def _terminate_group(proc: asyncio.subprocess.Process) -> None:
+    """SIGTERM the agent's process group, then SIGKILL it if it lingers."""
+    _kill_group(proc.pid)
+    try:
+        await asyncio.wait_for(proc.wait(), timeout=_KILL_GRACE_SECONDS)
+        return
+    except asyncio.TimeoutError:
+        pass
+    _kill_group(proc.pid, signal.SIGKILL)
+    await proc.wait()
+
+
+async def _supervise(
+    proc: asyncio.subprocess.Process,
+    command: str,
+    timeout_minutes: int,
+    transcript_path: Path,
+    events: "_LifecycleLog",
+) -> int:
+    """Stream the agent's output to *transcript_path* until it exits; return bytes written."""
+    written = 0
+
+    async def _stream(fout) -> None:
+        nonlocal written
+        assert proc.stdout is not None
+        while True:
+            chunk = await proc.stdout.read(_READ_CHUNK)
+            if not chunk:
+                break
+            written += fout.write(chunk)
+        await proc.wait()
+
+    # Raw bytes go straight to disk; only the footer slice is ever decoded.
+    with open(transcript_path, "wb", buffering=_TRANSCRIPT_BUFFER) as fout:
+        events.emit("started", pid=proc.pid)
+        try:
+            await asyncio.wait_for(_stream(fout), timeout=timeout_minutes * 60)
+        except asyncio.TimeoutError:
+            # Output so far is already on disk, so there is nothing to drain.
+            await _terminate_group(proc)
+            events.emit("killed", pid=proc.pid, reason="timeout", returncode=proc.returncode)
+            raise subprocess.TimeoutExpired(command, timeout_minutes * 60) from None
+    return written
+
+
+async def run_agent_async(
+    command: str,
+    repo_path: Path,
+    prompt_vars: PromptVars,
+    timeout_minutes: int,
+    transcript_path: Path,
+    prompt_template_path: Optional[str] = None,
+    prompt_flag: str = "--print",
+    on_spawn: Optional[Callable[[int], None]] = None,
+) -> AgentResult:
+    prompt = _render_prompt(prompt_vars, prompt_template_path)
+
+    with _LifecycleLog(lifecycle_path(transcript_path)) as events:
+        try:
+            # Own process group so a timeout kills the agent and anything it spawned.
+            # stderr is merged into stdout so the transcript keeps terminal ordering.
+            proc = await asyncio.create_subprocess_exec(
+                command,
+                prompt_flag,
+                prompt,
+                cwd=repo_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                start_new_session=True,
+            )
+        except OSError as exc:
+            events.emit("failed", error=str(exc), error_type=type(exc).__name__)
+            raise
+        events.emit("spawned", pid=proc.pid, command=command)
+        try:
+            if on_spawn:
+                on_spawn(proc.pid)
+            written = await _supervise(proc, command, timeout_minutes, transcript_path, events)
+        except BaseException:
+            # The agent runs in its own session, so Ctrl-C never reaches it:
+            # on cancellation, KeyboardInterrupt or any other failure it must
+            # be killed here or it keeps editing the repo unsupervised.
+            if proc.returncode is None:
+                await asyncio.shield(_terminate_group(proc))
+                events.emit("killed", pid=proc.pid, reason="aborted", returncode=proc.returncode)
+            raise
+
+        events.emit("completed", pid=proc.pid, exit_code=proc.returncode, transcript_length=written)
+    return AgentResult(proc.returncode, transcript_path, written)
+
+
+def lifecycle_path(transcript_path: Path) -> Path:
+    """Path of the lifecycle event log written next to a transcript."""
+    return transcript_path.with_suffix(".events.jsonl")
+
+
+class _LifecycleLog:
+    """Append-only JSON-lines log of agent lifecycle events.
+
+    Each event is one unbuffered write, so summaries can read this small file
+    instead of scanning the transcript. Write failures are swallowed; the log
+    must never break a run.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._fh = None
+
+    def __enter__(self) -> "_LifecycleLog":
+        try:
+            self._fh = open(self._path, "ab", buffering=0)  # noqa: SIM115
+        except OSError:
+            self._fh = None
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._fh:
+            self._fh.close()
+
+    def emit(self, event: str, **data: object) -> None:
+        if not self._fh:
+            return
+        try:
+            self._fh.write(json_bytes({"ts": time.time(), "event": event, **data}) + b"\n")
+        except OSError:
+            pass
+
+
+async def gather_agents(
+    specs: Sequence[AgentSpec],
+    max_concurrency: int = 4,
+) -> List[Union[AgentResult, BaseException]]:
+    """Run independent agents concurrently, at most *max_concurrency* at a time.
+
+    Results are returned in spec order; a failed run yields its exception
+    instead of raising, so one bad ticket does not cancel the others.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _bounded(spec: AgentSpec) -> AgentResult:
+        async with semaphore:
+            return await run_agent_async(**vars(spec))
+
+    return await asyncio.gather(*(_bounded(spec) for spec in specs), return_exceptions=True)
 
 
 def run_agent(
     command: str,
     repo_path: Path,
-    prompt_vars: Dict[str, str],
+    prompt_vars: PromptVars,
     timeout_minutes: int,
     transcript_path: Path,
     prompt_template_path: Optional[str] = None,
+    prompt_flag: str = "--print",
+    on_spawn: Optional[Callable[[int], None]] = None,
 ) -> AgentResult:
-    if prompt_template_path:
-        prompt_template = Path(prompt_template_path).read_text()
-    else:
-        prompt_template = DEFAULT_PROMPT
-    prompt = prompt_template.format(**prompt_vars)
-
-    proc = subprocess.run(
-        [command, "--print", prompt],
-        cwd=str(repo_path),
-        capture_output=True,
-        text=True,
-        timeout=timeout_minutes * 60,
+    return asyncio.run(
+        run_agent_async(
+            command,
+            repo_path,
+            prompt_vars,
+            timeout_minutes,
+            transcript_path,
+            prompt_template_path,
+            prompt_flag,
+            on_spawn,
+        )
     )
-    transcript = (proc.stdout or "") + "\n" + (proc.stderr or "")
-    transcript_path.write_text(transcript)
-    footer = None
-    for line in reversed(transcript.splitlines()):
-        parsed = parse_footer(line.strip())
-        if parsed:
-            footer = parsed
-            break
-    return AgentResult(proc.returncode, footer, transcript)
+
+
+@dataclass
+class SubagentHandle:
+    session_id: str
+    future: Future
+    transcript_path: Path
+    status: str = "pending"
+    pid: Optional[int] = None
+
+
+class SubagentRegistry:
+    """Runs agents on a thread pool and tracks them by session id.
+
+    Each worker thread drives its own event loop through ``run_agent``, so
+    the caller can keep writing artifacts while agents are still running.
+    """
+
+    def __init__(self, max_workers: int = 4) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="j2pr-agent")
+        self._handles: Dict[str, SubagentHandle] = {}
+        self._lock = threading.RLock()
+
+    def __enter__(self) -> "SubagentRegistry":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown(wait=exc_type is None)
+
+    def get(self, session_id: str) -> Optional[SubagentHandle]:
+        with self._lock:
+            return self._handles.get(session_id)
+
+    def spawn_async(self, spec: AgentSpec) -> SubagentHandle:
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            future = self._executor.submit(self._run, session_id, spec)
+            handle = SubagentHandle(session_id, future, spec.transcript_path)
+            self._handles[session_id] = handle
+        future.add_done_callback(lambda f, sid=session_id: self._finished(sid, f))
+        return handle
+
+    def gather_results(
+        self,
+        session_ids: Iterable[str],
+        wait_for: str = "all",
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Union[AgentResult, BaseException]]:
+        """Wait for the given agents and return results for those that finished.
+
+        ``wait_for`` is ``"all"`` or ``"first"``. Failed or cancelled runs map
+        to their exception rather than raising.
+        """
+        if wait_for not in {"all", "first"}:
+            raise ValueError(f"Unknown wait mode: {wait_for}")
+        with self._lock:
+            handles = [self._handles[sid] for sid in session_ids]
+        return_when = ALL_COMPLETED if wait_for == "all" else FIRST_COMPLETED
+        done, _ = wait([h.future for h in handles], timeout=timeout, return_when=return_when)
+        results: Dict[str, Union[AgentResult, BaseException]] = {}
+        for handle in handles:
+            if handle.future not in done:
+                continue
+            if handle.future.cancelled():
+                results[handle.session_id] = subprocess.SubprocessError("agent cancelled")
+                continue
+            exc = handle.future.exception()
+            results[handle.session_id] = exc if exc is not None else handle.future.result()
+        return results
+
+    def cancel_subagent(self, session_id: str) -> bool:
+        """Cancel a queued agent, or kill the process group of a running one."""
+        with self._lock:
+            handle = self._handles.get(session_id)
+            if handle is None:
+                return False
+            if handle.future.cancel():
+                handle.status = "cancelled"
+                return True
+            pid = handle.pid if handle.status == "running" else None
+            if pid is not None:
+                handle.status = "killed"
+        if pid is None:
+            return False
+        _kill_group(pid)
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool; without *wait*, queued agents are cancelled and running ones killed."""
+        if not wait:
+            with self._lock:
+                pids = [h.pid for h in self._handles.values() if h.status == "running" and h.pid is not None]
+            for pid in pids:
+                _kill_group(pid)
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    # -- internal --
+
+    def _run(self, session_id: str, spec: AgentSpec) -> AgentResult:
+        self._set_status(session_id, "running")
+        return run_agent(**vars(spec), on_spawn=lambda pid: self._set_pid(session_id, pid))
+
+    def _set_status(self, session_id: str, status: str) -> None:
+        with self._lock:
+            handle = self._handles.get(session_id)
+            if handle and handle.status == "pending":
+                handle.status = status
+
+    def _set_pid(self, session_id: str, pid: int) -> None:
+        with self._lock:
+            handle = self._handles.get(session_id)
+            if handle:
+                handle.pid = pid
+
+    def _finished(self, session_id: str, future: Future) -> None:
+        with self._lock:
+            handle = self._handles.get(session_id)
+            if handle is None or handle.status in {"cancelled", "killed"}:
+                return
+            if future.cancelled():
+                handle.status = "cancelled"
+                return
+            handle.status = "failed" if future.exception() is not None else "completed"
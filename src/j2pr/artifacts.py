@@ -1,21 +1,154 @@
 from __future__ import annotations
 
+import os
+import threading
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Set, Union
 
-from .util import write_json
+from .util import json_bytes, write_json
+
+RUNS_ROOT = Path("~/.j2pr/runs").expanduser()
+
+_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+
+_CREATED_DIRS: Set[Path] = set()
+_CREATED_DIRS_LOCK = threading.Lock()
 
 
 def artifacts_root(ticket_key: str, run_id: str) -> Path:
-    return Path("~/.j2pr/runs").expanduser() / ticket_key / run_id
+    return RUNS_ROOT / ticket_key / run_id
+
+
+def _ensure_dir(path: Path) -> None:
+    """mkdir -p *path* once per process; later calls for the same dir are free."""
+    if path in _CREATED_DIRS:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    with _CREATED_DIRS_LOCK:
+        _CREATED_DIRS.add(path)
+
+
+def _write_fd(path: Path, data: bytes) -> int:
+    """Open *path* for writing, write all of *data*, and return the open fd."""
+    fd = os.open(path, _OPEN_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
 
 
-def write_artifacts(base: Path, files: Dict[str, str]) -> None:
-    base.mkdir(parents=True, exist_ok=True)
+def _write_file(path: Path, data: bytes, sync: bool = False) -> None:
+    # One open/write/close per file, without the TextIOWrapper/BufferedWriter stack.
+    fd = _write_fd(path, data)
+    try:
+        if sync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_artifacts(base: Path, files: Dict[str, Union[str, bytes]]) -> None:
+    _ensure_dir(base)
     for name, content in files.items():
-        (base / name).write_text(content)
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        _write_file(base / name, data)
 
 
 def write_artifact_json(base: Path, name: str, payload: dict) -> None:
-    base.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(base)
     write_json(base / name, payload)
+
+
+FLUSH_POLICIES = ("none", "per_batch", "per_file")
+
+
+class ArtifactBatch:
+    """Collect artifact writes in memory and flush them in one pass.
+
+    Writes to the same name are coalesced (last one wins). Pending data is
+    flushed once it reaches *max_pending* bytes and on context exit.
+
+    ``flush_policy`` controls durability:
+      - ``none``: rely on the page cache, no fsync.
+      - ``per_batch`` (default): write every file first, then fsync them and
+        the directory together at the end of the flush.
+      - ``per_file``: fsync each file before moving to the next.
+
+    Usage::
+
+        with ArtifactBatch(artifacts_dir) as batch:
+            batch.add_json("pr.json", {"pr_url": pr_url})
+            batch.add_text("commands.json", ...)
+    """
+
+    def __init__(
+        self,
+        base: Path,
+        max_pending: int = 256 * 1024,
+        flush_policy: str = "per_batch",
+    ) -> None:
+        if flush_policy not in FLUSH_POLICIES:
+            raise ValueError(f"Unknown flush policy: {flush_policy}")
+        self._base = base
+        self._max_pending = max_pending
+        self._flush_policy = flush_policy
+        self._pending: Dict[str, bytes] = {}
+        self._size = 0
+
+    def __enter__(self) -> "ArtifactBatch":
+        # Create the directory up front so files streamed outside the batch
+        # (e.g. the agent transcript) have somewhere to go.
+        _ensure_dir(self._base)
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.flush()
+
+    def add_text(self, name: str, content: Union[str, bytes]) -> None:
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        previous = self._pending.get(name)
+        if previous is not None:
+            self._size -= len(previous)
+        self._pending[name] = data
+        self._size += len(data)
+        if self._size >= self._max_pending:
+            self.flush()
+
+    def add_json(self, name: str, payload: Any) -> None:
+        self.add_text(name, json_bytes(payload))
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        _ensure_dir(self._base)
+        if self._flush_policy == "per_batch":
+            # Issue every write before the first fsync so the filesystem can
+            # commit them together, then record the new entries via the dir.
+            fds = []
+            try:
+                for name, data in self._pending.items():
+                    fds.append(_write_fd(self._base / name, data))
+                for fd in fds:
+                    os.fsync(fd)
+            finally:
+                for fd in fds:
+                    os.close(fd)
+            _fsync_dir(self._base)
+        else:
+            sync = self._flush_policy == "per_file"
+            for name, data in self._pending.items():
+                _write_file(self._base / name, data, sync=sync)
+        self._pending.clear()
+        self._size = 0
@@ -2,41 +2,18 @@ from __future__ import annotations
 
 import json
 import os
+import re
 import shlex
 import uuid
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import typer
 from rich.console import Console
-from rich.table import Table
-
-from .agent import run_agent
-from .artifacts import artifacts_root, write_artifact_json, write_artifacts
-from .config import config_path_from_env, load_config
-from .footer import AgentFooter
-from .github import (
-    create_pr_with_gh,
-    create_pr_with_rest,
-    ensure_gh,
-    find_pr_with_gh,
-    find_pr_by_jira_with_gh,
-    find_pr_with_rest,
-    find_pr_by_jira_with_rest,
-)
-from .guardrails import enforce_deny_globs, enforce_diff_limits
-from .jira import add_comment, search_issues
+
+from .artifacts import ArtifactBatch, artifacts_root
+from .config import DEFAULT_CONFIG_PATH, AppConfig, check_config_shape, config_path_from_env, load_config
 from .logging import log_event, setup_logger
-from .mapping import infer_repo_from_issue, map_repo
-from .repo import (
-    create_branch,
-    detect_default_branch,
-    detect_test_command,
-    diff_patch,
-    ensure_clean_worktree,
-    fetch_and_checkout_base,
-    remote_branch_exists,
-)
 from .session_capture import (
     list_sessions,
     read_session_events,
@@ -50,37 +27,120 @@ from .state import (
     clear_all_locks,
     clear_lock,
     dump_table,
+    dump_table_iter,
     get_lock,
     get_ticket,
     init_db,
-    set_lock,
+    transaction,
+    try_acquire_lock,
     upsert_ticket,
     finish_run,
 )
-from .util import run_command
+from .util import expand_path, json_bytes, json_text, run_command_to_file
+
+if TYPE_CHECKING:
+    import subprocess
+
+    from .footer import AgentFooter
+    from .jira import JiraIssue
+
+# Rich tables and the agent, Jira, GitHub and git helpers (which pull in
+# requests) are imported inside the commands that use them, so cheap
+# commands such as status, open and tail start fast.
 
 app = typer.Typer(no_args_is_help=True)
 console = Console()
 
+# One dash per non-alphanumeric character, as branch names have always been
+# built; collapsing runs would rename the branch of an in-flight ticket.
+_SLUG_RE = re.compile(r"[^a-z0-9]")
+
+_NEEDS_HUMAN_MARKERS = (
+    "Worktree not clean",
+    "Deny glob violation",
+    "Diff limits exceeded",
+    "Agent contract missing footer",
+    "Tests failed",
+    "Repo mapping ambiguous",
+)
+_NEEDS_HUMAN_RE = re.compile("|".join(map(re.escape, _NEEDS_HUMAN_MARKERS)))
 
-def _load_config_or_exit() -> tuple:
+# scan only renders key and summary; the full config.jira.fields set is for run.
+_SCAN_FIELDS = ["summary"]
+
+
+# Parsed configs keyed by (path, mtime_ns) so repeat loads in one process skip
+# the YAML parse and Pydantic validation.
+_CONFIG_CACHE: dict[tuple[str, int], AppConfig] = {}
+
+
+def _load_config_or_exit() -> AppConfig:
     config_path = config_path_from_env()
+    path = expand_path(config_path) if config_path else DEFAULT_CONFIG_PATH
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except OSError:
+        key = None
+    if key in _CONFIG_CACHE:
+        return _CONFIG_CACHE[key]
     result = load_config(config_path)
     if not result.config:
         for err in result.errors:
             console.print(f"[red]Config error:[/red] {err}")
         raise typer.Exit(code=2)
+    if key:
+        _CONFIG_CACHE[key] = result.config
     return result.config
 
 
+def _apply_rate_limits(config: AppConfig) -> None:
+    from .http import set_rate_limit
+
+    set_rate_limit("jira", config.jira.rate_limit)
+
+
 def _slug(text: str) -> str:
+    if text.isascii():
+        # ASCII lowercasing is per character and isalnum() is [A-Za-z0-9],
+        # so the regex gives the same result as the loop below.
+        return _SLUG_RE.sub("-", text.lower()).strip("-")
     return "".join(c.lower() if c.isalnum() else "-" for c in text).strip("-")
 
 
+# ADF nodes that end a line when flattened to text.
+_ADF_BLOCK_TYPES = frozenset(
+    {"paragraph", "heading", "listItem", "blockquote", "codeBlock", "rule", "tableRow", "panel"}
+)
+
+
+def _adf_to_text(node: object) -> str:
+    """Flatten an Atlassian Document Format tree to plain text in one walk."""
+    parts: list[str] = []
+
+    def walk(item: object) -> None:
+        if isinstance(item, list):
+            for child in item:
+                walk(child)
+            return
+        if not isinstance(item, dict):
+            return
+        node_type = item.get("type")
+        if node_type == "text":
+            parts.append(str(item.get("text", "")))
+        elif node_type == "hardBreak":
+            parts.append("\n")
+        walk(item.get("content"))
+        if node_type in _ADF_BLOCK_TYPES:
+            parts.append("\n")
+
+    walk(node)
+    return "".join(parts).strip()
+
+
 def _extract_description(fields: dict) -> str:
     desc = fields.get("description")
     if isinstance(desc, dict) and "content" in desc:
-        return json.dumps(desc)
+        return _adf_to_text(desc)
     if isinstance(desc, str):
         return desc
     return ""
@@ -100,28 +160,17 @@ def _ticket_ok(fields: dict) -> bool:
 
 
 def _repo_path(root_dir: str, repo: str) -> Path:
-    return Path(root_dir).expanduser() / repo
+    return expand_path(root_dir) / repo
 
 
 def _pr_body(footer: AgentFooter, test_command: str) -> str:
-    changes = "\n".join(f"- {item}" for item in footer.changes) if footer.changes else "- n/a"
-    return "\n".join(
-        [
-            "## Summary",
-            footer.summary or "n/a",
-            "",
-            "## Changes",
-            changes,
-            "",
-            "## How to Test",
-            f"- {test_command}",
-            "",
-            "## Risk / Rollout Notes",
-            footer.risk or "n/a",
-            "",
-            "## Notes for Reviewer",
-            footer.notes_for_reviewer or "n/a",
-        ]
+    changes = "\n".join(map("- {}".format, footer.changes)) if footer.changes else "- n/a"
+    return (
+        f"## Summary\n{footer.summary or 'n/a'}\n\n"
+        f"## Changes\n{changes}\n\n"
+        f"## How to Test\n- {test_command}\n\n"
+        f"## Risk / Rollout Notes\n{footer.risk or 'n/a'}\n\n"
+        f"## Notes for Reviewer\n{footer.notes_for_reviewer or 'n/a'}"
     )
 
 
@@ -138,45 +187,95 @@ def _require_github_token(config) -> str:
     return token
 
 
-def _denylist_ok(commands: list[str], denylist: list[str]) -> bool:
+def _existing_pr_or_push(
+    config: AppConfig, repo: str, repo_path: Path, branch: str, jira_key: str
+) -> tuple[Optional[str], Optional[str], Optional["subprocess.Popen"]]:
+    """Return ``(pr_url, source, None)`` for an existing PR, else ``(None, None, push)``.
+
+    The branch-head and Jira-key lookups run concurrently, branch first by
+    priority. ``git push`` is only started once both came back empty, so a
+    found PR never gets new commits or a stray remote branch; the caller
+    awaits *push* with ``finish_push`` before creating the PR.
+    """
+    from .github import (
+        find_pr_by_jira_with_gh,
+        find_pr_by_jira_with_rest,
+        find_pr_with_gh,
+        find_pr_with_rest,
+        first_pr_hit,
+    )
+    from .repo import remote_branch_exists, start_push
+
+    github = config.github
+    lookups = {}
+    if remote_branch_exists(repo_path, branch):
+        if github.use_gh_cli:
+            lookups["branch"] = lambda: find_pr_with_gh(branch, cwd=repo_path)
+        else:
+            lookups["branch"] = lambda: find_pr_with_rest(github.owner, repo, branch, _require_github_token(config))
+    if github.use_gh_cli:
+        lookups["jira_key"] = lambda: find_pr_by_jira_with_gh(jira_key, cwd=repo_path)
+    else:
+        lookups["jira_key"] = lambda: find_pr_by_jira_with_rest(
+            github.owner, repo, jira_key, _require_github_token(config)
+        )
+    pr_url, source = first_pr_hit(lookups)
+    if pr_url:
+        return pr_url, source, None
+    return None, None, start_push(repo_path, branch)
+
+
+def _denylist_matcher(denylist: list[str]) -> Optional[re.Pattern[str]]:
+    """Compile the command denylist into one alternation, built once per run."""
     if not denylist:
+        return None
+    return re.compile("|".join(re.escape(denied) for denied in denylist))
+
+
+def _denylist_ok(new_commands: list[str], matcher: Optional[re.Pattern[str]]) -> bool:
+    # Commands already checked are never rescanned; only the newly added ones are.
+    if matcher is None:
         return True
-    joined = " ; ".join(commands)
-    for denied in denylist:
-        if denied in joined:
-            return False
-    return True
+    return not any(matcher.search(command) for command in new_commands)
+
+
+def _record_commands(commands: list[str], new_commands: list[str], matcher: Optional[re.Pattern[str]]) -> None:
+    """Append *new_commands* to the run's command log, refusing denylisted ones."""
+    if not _denylist_ok(new_commands, matcher):
+        raise RuntimeError("Command denylist violation")
+    commands.extend(new_commands)
 
 
 def _classify_error(message: str) -> str:
-    needs_human_markers = [
-        "Worktree not clean",
-        "Deny glob violation",
-        "Diff limits exceeded",
-        "Agent contract missing footer",
-        "Tests failed",
-        "Repo mapping ambiguous",
-    ]
-    for marker in needs_human_markers:
-        if marker in message:
-            return "NEEDS_HUMAN"
-    return "FAILED"
+    return "NEEDS_HUMAN" if _NEEDS_HUMAN_RE.search(message) else "FAILED"
 
 
 @app.command()
-def config_validate() -> None:
-    load_result = load_config(config_path_from_env())
-    if load_result.config:
+def config_validate(
+    fast: bool = typer.Option(False, "--fast", help="Only check YAML syntax and required sections"),
+    strict: bool = typer.Option(False, "--strict", help="Ignore the config cache and fully validate"),
+) -> None:
+    _CONFIG_CACHE.clear()
+    if fast and not strict:
+        errors = check_config_shape(config_path_from_env())
+    else:
+        errors = load_config(config_path_from_env(), strict=strict).errors
+    if not errors:
         console.print("[green]Config valid[/green]")
         raise typer.Exit(code=0)
-    for err in load_result.errors:
+    for err in errors:
         console.print(f"[red]Config error:[/red] {err}")
     raise typer.Exit(code=2)
 
 
 @app.command()
 def scan(limit: int = 20, json_output: bool = typer.Option(False, "--json")) -> None:
+    from rich.table import Table
+
+    from .jira import search_issues
+
     config = _load_config_or_exit()
+    _apply_rate_limits(config)
     init_db()
     try:
         issues = search_issues(
@@ -185,7 +284,7 @@ def scan(limit: int = 20, json_output: bool = typer.Option(False, "--json")) ->
             config.jira.api_token,
             config.jira.api_version,
             config.jira.jql,
-            config.jira.fields,
+            _SCAN_FIELDS,
             limit,
         )
     except RuntimeError as exc:
@@ -202,7 +301,7 @@ def scan(limit: int = 20, json_output: bool = typer.Option(False, "--json")) ->
             table.add_row(row["key"], str(row["summary"]))
         console.print(table)
     if json_output:
-        console.print(json.dumps(rows, indent=2))
+        console.print(json_text(rows, indent=True))
 
 
 @app.command()
@@ -212,14 +311,21 @@ def run(
     no_comment: bool = False,
     force: bool = False,
 ) -> None:
-    config = _load_config_or_exit()
-    init_db()
-    logger = setup_logger()
+    _run_impl(_load_config_or_exit(), jira_key, rerun, no_comment, force)
 
-    ticket = get_ticket(jira_key)
-    if ticket and ticket.status in {"PR_OPENED", "DONE"} and ticket.pr_url and not rerun:
-        console.print(ticket.pr_url)
-        raise typer.Exit(code=0)
+
+def _run_impl(
+    config: AppConfig,
+    jira_key: str,
+    rerun: bool = False,
+    no_comment: bool = False,
+    force: bool = False,
+) -> None:
+    from .jira import search_issues
+
+    init_db()
+    _apply_rate_limits(config)
+    _exit_if_pr_opened(jira_key, rerun)
 
     try:
         issues = search_issues(
@@ -237,7 +343,44 @@ def run(
     if not issues:
         console.print(f"[red]Ticket {jira_key} not found[/red]")
         raise typer.Exit(code=3)
-    issue = issues[0]
+    _execute(config, issues[0], rerun, no_comment, force)
+
+
+def _exit_if_pr_opened(jira_key: str, rerun: bool) -> None:
+    ticket = get_ticket(jira_key)
+    if ticket and ticket.status in {"PR_OPENED", "DONE"} and ticket.pr_url and not rerun:
+        console.print(ticket.pr_url)
+        raise typer.Exit(code=0)
+
+
+def _execute(
+    config: AppConfig,
+    issue: JiraIssue,
+    rerun: bool = False,
+    no_comment: bool = False,
+    force: bool = False,
+) -> None:
+    from .agent import PromptVars, run_agent
+    from .github import (
+        create_pr_with_gh,
+        create_pr_with_rest,
+        ensure_gh,
+    )
+    from .guardrails import check_deny_globs, check_diff_limits
+    from .jira import add_comment
+    from .mapping import infer_repo_from_issue, map_repo
+    from .repo import (
+        create_branch,
+        detect_default_branch_cached,
+        detect_test_command_cached,
+        ensure_clean_worktree,
+        fetch_and_checkout_base,
+        finish_push,
+        gather_diff_info,
+    )
+
+    jira_key = issue.key
+    logger = setup_logger()
 
     if not _ticket_ok(issue.fields) and not force:
         upsert_ticket(
@@ -265,38 +408,36 @@ def run(
         raise typer.Exit(code=2)
 
     run_id = uuid.uuid4().hex
-    lock = get_lock(repo)
-    if lock and lock != run_id:
-        console.print(f"[yellow]Repo locked by run {lock}[/yellow]")
+    if not try_acquire_lock(repo, run_id):
+        console.print(f"[yellow]Repo locked by run {get_lock(repo)}[/yellow]")
         raise typer.Exit(code=2)
 
-    set_lock(repo, run_id)
     repo_path = _repo_path(config.workspace.root_dir, repo)
     if not repo_path.exists():
-        clear_lock(repo)
+        clear_lock(repo, run_id)
         console.print("[red]Repo not found locally[/red]")
         raise typer.Exit(code=3)
 
     # Resolve test command — auto-detect from repo contents when set to "auto".
     test_command = config.guardrails.test_command
     if test_command.lower() == "auto":
-        detected = detect_test_command(repo_path)
+        detected = detect_test_command_cached(repo_path)
         if detected:
             test_command = detected
         elif config.guardrails.require_tests:
-            clear_lock(repo)
+            clear_lock(repo, run_id)
             console.print("[red]Could not auto-detect test command and require_tests is enabled[/red]")
             raise typer.Exit(code=2)
         else:
             test_command = ""
 
     run_state = RunState(run_id, jira_key, "RUNNING", repo, None, None, str(artifacts_root(jira_key, run_id)), None)
-    add_run(run_state)
-    upsert_ticket(TicketState(jira_key, "RUNNING", repo, None, None, run_id, None))
+    with transaction():
+        add_run(run_state)
+        upsert_ticket(TicketState(jira_key, "RUNNING", repo, None, None, run_id, None))
     log_event(logger, "run_started", {"ticket": jira_key, "repo": repo, "run_id": run_id})
 
     artifacts_dir = artifacts_root(jira_key, run_id)
-    write_artifact_json(artifacts_dir, "ticket.json", issue.fields)
 
     title = str(issue.fields.get("summary", ""))
     description = _extract_description(issue.fields)
@@ -304,8 +445,14 @@ def run(
     branch = f"j2pr/{jira_key}-{_slug(title)[:50]}".rstrip("-")
 
     commands = []
-
-    with session_or_noop(config.session_capture, ticket=jira_key, run_id=run_id) as cap:
+    denylist = _denylist_matcher(config.guardrails.command_denylist)
+
+    # Small artifacts are buffered and written together when the run ends,
+    # whichever way it ends.
+    with ArtifactBatch(artifacts_dir) as artifacts, session_or_noop(
+        config.session_capture, ticket=jira_key, run_id=run_id
+    ) as cap:
+        artifacts.add_json("ticket.json", issue.fields)
         cap.snapshot_config(config.model_dump())
         cap.event("run_initiated", {
             "ticket": jira_key,
@@ -319,17 +466,20 @@ def run(
         })
 
         try:
+            if config.github.use_gh_cli:
+                # Fail before the agent runs rather than at PR creation.
+                ensure_gh()
             if config.guardrails.require_clean_worktree:
                 cap.event("worktree_check_started")
                 clean, status = ensure_clean_worktree(repo_path)
-                write_artifacts(artifacts_dir, {"pre_git_status.txt": status})
+                artifacts.add_text("pre_git_status.txt", status)
                 cap.event("worktree_check_finished", {"clean": clean, "status": status})
                 if not clean and not force:
                     raise RuntimeError("Worktree not clean")
 
             base_branch = config.github.default_base_branch
             if base_branch.lower() == "auto":
-                detected = detect_default_branch(repo_path)
+                detected = detect_default_branch_cached(repo_path)
                 if detected:
                     base_branch = detected
                     log_event(logger, "auto_detected_branch", {"repo": repo, "branch": base_branch})
@@ -338,35 +488,36 @@ def run(
                     log_event(logger, "auto_detect_fallback", {"repo": repo, "branch": base_branch})
 
             cap.event("branch_setup_started", {"base_branch": base_branch, "branch": branch})
+            # Commands are checked against the denylist before they run.
+            _record_commands(commands, [
+                f"git fetch --all",
+                f"git checkout {base_branch}",
+                f"git pull --rebase",
+                f"git checkout -B {branch}",
+            ], denylist)
             fetch_and_checkout_base(repo_path, base_branch)
             create_branch(repo_path, branch)
-            commands.extend(
-                [
-                    f"git fetch --all",
-                    f"git checkout {base_branch}",
-                    f"git pull --rebase",
-                    f"git checkout -B {branch}",
-                ]
-            )
             cap.event("branch_setup_finished", {"branch": branch, "base_branch": base_branch})
-            if not _denylist_ok(commands, config.guardrails.command_denylist):
-                raise RuntimeError("Command denylist violation")
-
-            prompt_vars = {
-                "ticket_key": jira_key,
-                "title": title,
-                "description": description,
-                "acceptance": acceptance,
-                "repo_path": str(repo_path),
-                "base_branch": base_branch,
-                "deny_globs": ", ".join(config.guardrails.deny_globs),
-                "max_files": str(config.guardrails.max_files_changed),
-                "max_lines": str(config.guardrails.max_diff_lines),
-                "test_command": test_command,
-                "format_command": config.guardrails.format_command,
-                "do_not_touch": ", ".join(config.guardrails.deny_globs),
-                "notes_for_agent": "",
-            }
+
+            deny_globs_text = ", ".join(config.guardrails.deny_globs)
+            prompt_vars = PromptVars(
+                ticket_key=jira_key,
+                title=title,
+                description=description,
+                acceptance=acceptance,
+                repo_path=str(repo_path),
+                base_branch=base_branch,
+                deny_globs=deny_globs_text,
+                max_files=str(config.guardrails.max_files_changed),
+                max_lines=str(config.guardrails.max_diff_lines),
+                test_command=test_command,
+                format_command=config.guardrails.format_command,
+                do_not_touch=deny_globs_text,
+            )
+
+            # Commands are tokenized once; the loop below only re-runs them.
+            format_argv = shlex.split(config.guardrails.format_command)
+            test_argv = shlex.split(test_command) if config.guardrails.require_tests else []
 
             agent_result = None
             fix_attempts = 0
@@ -379,36 +530,35 @@ def run(
                     config.cursor.timeout_minutes,
                     artifacts_dir / "agent_transcript.log",
                     config.cursor.prompt_template_path or None,
+                    config.cursor.prompt_flag,
                 )
                 cap.event("agent_invocation_finished", {
                     "exit_code": agent_result.exit_code,
                     "has_footer": agent_result.footer is not None,
-                    "transcript_length": len(agent_result.transcript),
+                    "transcript_length": agent_result.transcript_length,
                 })
                 if not agent_result.footer:
                     raise RuntimeError("Agent contract missing footer")
 
                 if config.guardrails.format_command:
+                    _record_commands(commands, [config.guardrails.format_command], denylist)
                     cap.event("format_started", {"command": config.guardrails.format_command})
-                    fmt = run_command(shlex.split(config.guardrails.format_command), cwd=repo_path)
-                    commands.append(config.guardrails.format_command)
-                    write_artifacts(artifacts_dir, {"format_output.log": fmt.stdout + fmt.stderr})
-                    cap.event("format_finished", {"returncode": fmt.returncode})
-                    if not _denylist_ok(commands, config.guardrails.command_denylist):
-                        raise RuntimeError("Command denylist violation")
+                    fmt_returncode = run_command_to_file(
+                        format_argv, artifacts_dir / "format_output.log", cwd=repo_path
+                    )
+                    cap.event("format_finished", {"returncode": fmt_returncode})
 
                 if config.guardrails.require_tests:
+                    _record_commands(commands, [test_command], denylist)
                     cap.event("tests_started", {"command": test_command})
-                    test = run_command(shlex.split(test_command), cwd=repo_path)
-                    commands.append(test_command)
-                    write_artifacts(artifacts_dir, {"test_output.log": test.stdout + test.stderr})
+                    test_returncode = run_command_to_file(
+                        test_argv, artifacts_dir / "test_output.log", cwd=repo_path
+                    )
                     cap.event("tests_finished", {
-                        "returncode": test.returncode,
-                        "passed": test.returncode == 0,
+                        "returncode": test_returncode,
+                        "passed": test_returncode == 0,
                     })
-                    if not _denylist_ok(commands, config.guardrails.command_denylist):
-                        raise RuntimeError("Command denylist violation")
-                    if test.returncode != 0:
+                    if test_returncode != 0:
                         fix_attempts += 1
                         cap.event("test_fix_cycle", {
                             "attempt": fix_attempts,
@@ -416,17 +566,22 @@ def run(
                         })
                         if fix_attempts > config.guardrails.max_fix_attempts:
                             raise RuntimeError("Tests failed")
-                        prompt_vars["notes_for_agent"] = "Tests failed; please fix and re-run tests."
+                        prompt_vars.notes_for_agent = "Tests failed; please fix and re-run tests."
                         continue
                 break
 
             cap.event("guardrails_check_started")
-            ok, blocked = enforce_deny_globs(repo_path, config.guardrails.deny_globs)
+            # The patch can be large; it goes straight to disk, not through the batch.
+            diff_info = gather_diff_info(repo_path, patch_path=artifacts_dir / "diff.patch")
+            # One numstat feeds both checks: its paths for the deny globs and
+            # its line counts for the diff limits.
+            numstat = diff_info.numstat
+            ok, blocked = check_deny_globs((name for _, _, name in numstat), config.guardrails.deny_globs)
             if not ok:
                 cap.event("guardrails_deny_glob_violation", {"blocked_files": blocked})
                 raise RuntimeError(f"Deny glob violation: {', '.join(blocked)}")
-            ok, files_changed, lines_changed = enforce_diff_limits(
-                repo_path, config.guardrails.max_files_changed, config.guardrails.max_diff_lines
+            ok, files_changed, lines_changed = check_diff_limits(
+                numstat, config.guardrails.max_files_changed, config.guardrails.max_diff_lines
             )
             cap.event("guardrails_check_finished", {
                 "deny_globs_ok": True,
@@ -437,48 +592,17 @@ def run(
             if not ok:
                 raise RuntimeError(f"Diff limits exceeded: {files_changed} files, {lines_changed} lines")
 
-            write_artifacts(
-                artifacts_dir,
-                {
-                    "post_git_status.txt": ensure_clean_worktree(repo_path)[1],
-                    "diff.patch": diff_patch(repo_path),
-                    "commands.json": json.dumps(commands, indent=2),
-                },
-            )
+            artifacts.add_text("post_git_status.txt", diff_info.status)
+            artifacts.add_text("commands.json", json_bytes(commands, indent=True))
 
             cap.event("pr_lookup_started")
-            if remote_branch_exists(repo_path, branch):
-                if config.github.use_gh_cli:
-                    pr_url = find_pr_with_gh(branch, cwd=repo_path)
-                else:
-                    pr_url = find_pr_with_rest(
-                        config.github.owner,
-                        repo,
-                        branch,
-                        _require_github_token(config),
-                    )
-                if pr_url:
-                    cap.event("existing_pr_found", {"pr_url": pr_url, "source": "branch"})
+            pr_url, source, push = _existing_pr_or_push(config, repo, repo_path, branch, jira_key)
+            if pr_url:
+                cap.event("existing_pr_found", {"pr_url": pr_url, "source": source})
+                with transaction():
                     upsert_ticket(TicketState(jira_key, "PR_OPENED", repo, branch, pr_url, run_id, None))
                     finish_run(run_id, "PR_OPENED", pr_url, agent_result.exit_code)
-                    clear_lock(repo)
-                    console.print(pr_url)
-                    raise typer.Exit(code=0)
-
-            if config.github.use_gh_cli:
-                pr_url = find_pr_by_jira_with_gh(jira_key, cwd=repo_path)
-            else:
-                pr_url = find_pr_by_jira_with_rest(
-                    config.github.owner,
-                    repo,
-                    jira_key,
-                    _require_github_token(config),
-                )
-            if pr_url:
-                cap.event("existing_pr_found", {"pr_url": pr_url, "source": "jira_key"})
-                upsert_ticket(TicketState(jira_key, "PR_OPENED", repo, branch, pr_url, run_id, None))
-                finish_run(run_id, "PR_OPENED", pr_url, agent_result.exit_code)
-                clear_lock(repo)
+                    clear_lock(repo, run_id)
                 console.print(pr_url)
                 raise typer.Exit(code=0)
 
@@ -486,10 +610,11 @@ def run(
             pr_title = f"[{jira_key}] {title}"
             pr_body = _pr_body(agent_result.footer, test_command)
 
-            run_command(["git", "push", "-u", "origin", branch], cwd=repo_path)
+            pushed = finish_push(push)
+            if pushed.returncode != 0:
+                raise RuntimeError(f"git push failed: {pushed.stdout.strip()}")
 
             if config.github.use_gh_cli:
-                ensure_gh()
                 pr_url = create_pr_with_gh(
                     pr_title,
                     pr_body,
@@ -524,26 +649,31 @@ def run(
                     f"PR opened: {pr_url}",
                 )
 
-            upsert_ticket(TicketState(jira_key, "PR_OPENED", repo, branch, pr_url, run_id, None))
-            finish_run(run_id, "PR_OPENED", pr_url, agent_result.exit_code)
-            write_artifact_json(artifacts_dir, "pr.json", {"pr_url": pr_url, "ticket": jira_key})
-            write_artifact_json(artifacts_dir, "summary.json", {"pr_url": pr_url, "ticket": jira_key})
-            clear_lock(repo)
+            artifacts.add_json("pr.json", {"pr_url": pr_url, "ticket": jira_key})
+            artifacts.add_json("summary.json", {"pr_url": pr_url, "ticket": jira_key})
+            with transaction():
+                upsert_ticket(TicketState(jira_key, "PR_OPENED", repo, branch, pr_url, run_id, None))
+                finish_run(run_id, "PR_OPENED", pr_url, agent_result.exit_code)
+                clear_lock(repo, run_id)
             cap.event("run_succeeded", {"pr_url": pr_url})
             console.print(pr_url)
         except Exception as exc:
             cap.event("run_failed", {"error": str(exc), "error_type": type(exc).__name__})
             status = _classify_error(str(exc))
-            finish_run(run_id, status, None, None)
-            upsert_ticket(TicketState(jira_key, status, repo, None, None, run_id, str(exc)))
-            clear_lock(repo)
+            with transaction():
+                finish_run(run_id, status, None, None)
+                upsert_ticket(TicketState(jira_key, status, repo, None, None, run_id, str(exc)))
+                clear_lock(repo, run_id)
             console.print(f"[red]Failed:[/red] {exc}")
             raise typer.Exit(code=2 if status == "NEEDS_HUMAN" else 3)
 
 
 @app.command("run-next")
 def run_next() -> None:
+    from .jira import search_issues
+
     config = _load_config_or_exit()
+    _apply_rate_limits(config)
     try:
         issues = search_issues(
             config.jira.base_url,
@@ -560,7 +690,10 @@ def run_next() -> None:
     if not issues:
         console.print("[yellow]No eligible tickets[/yellow]")
         raise typer.Exit(code=0)
-    run(issues[0].key)
+    # The search already returned the issue with its fields; skip the re-fetch.
+    init_db()
+    _exit_if_pr_opened(issues[0].key, rerun=False)
+    _execute(config, issues[0])
 
 
 @app.command()
@@ -573,7 +706,7 @@ def status(ticket: Optional[str] = None) -> None:
     if not state:
         console.print("[yellow]No state found[/yellow]")
         raise typer.Exit(code=0)
-    console.print(json.dumps(state.__dict__, indent=2))
+    console.print(json_text(state.__dict__, indent=True))
 
 
 @app.command()
@@ -598,7 +731,7 @@ def tail(ticket: str, latest: bool = True) -> None:
     if not path.exists():
         console.print("[yellow]No transcript found[/yellow]")
         raise typer.Exit(code=0)
-    console.print(path.read_text())
+    console.print(path.read_bytes().decode("utf-8", errors="replace"))
 
 
 @app.command()
@@ -608,18 +741,17 @@ def sessions(
     json_output: bool = typer.Option(False, "--json"),
 ) -> None:
     """List captured sessions, optionally filtered by ticket."""
+    from rich.table import Table
+
     config = _load_config_or_exit()
-    all_sessions = list_sessions(config.session_capture.output_dir)
-    if ticket:
-        all_sessions = [s for s in all_sessions if s.get("ticket") == ticket]
-    all_sessions = all_sessions[:limit]
+    all_sessions = list_sessions(config.session_capture.output_dir, ticket=ticket, limit=limit)
     if not all_sessions:
         console.print("[yellow]No captured sessions found[/yellow]")
         if not config.session_capture.enabled:
             console.print("[dim]Session capture is disabled. Enable it in config: session_capture.enabled: true[/dim]")
         raise typer.Exit(code=0)
     if json_output:
-        console.print(json.dumps(all_sessions, indent=2))
+        console.print(json_text(all_sessions, indent=True))
     else:
         table = Table(title="Captured Sessions")
         table.add_column("Ticket", style="bold")
@@ -652,10 +784,7 @@ def session(
 ) -> None:
     """View a captured session. Shows manifest by default; use --events or --output for details."""
     config = _load_config_or_exit()
-    all_sessions = list_sessions(config.session_capture.output_dir)
-    matching = [s for s in all_sessions if s.get("ticket") == ticket]
-    if run_id:
-        matching = [s for s in matching if s.get("run_id") == run_id or s.get("run_id", "").startswith(run_id)]
+    matching = list_sessions(config.session_capture.output_dir, ticket=ticket, run_id_prefix=run_id, limit=1)
     if not matching:
         console.print("[yellow]No matching session found[/yellow]")
         raise typer.Exit(code=0)
@@ -665,7 +794,7 @@ def session(
     if events:
         evt_list = read_session_events(session_path)
         if json_output:
-            console.print(json.dumps(evt_list, indent=2))
+            console.print(json_text(evt_list, indent=True))
         else:
             for evt in evt_list:
                 elapsed = evt.get("elapsed_s", 0)
@@ -681,7 +810,7 @@ def session(
             console.print("[yellow]No output captured[/yellow]")
     else:
         if json_output:
-            console.print(json.dumps(session_info, indent=2))
+            console.print(json_text(session_info, indent=True))
         else:
             console.print(f"[bold]Session:[/bold] {session_info.get('ticket')} / {session_info.get('run_id')}")
             console.print(f"[bold]Started:[/bold]  {session_info.get('started_at', '?')}")
@@ -727,6 +856,8 @@ def db_cmd(
     as_json: bool = typer.Option(False, "--json", help="Output raw JSON instead of tables."),
 ) -> None:
     """Show the current j2pr database state."""
+    from rich.table import Table
+
     init_db()
     tables = [table] if table else list(DB_TABLES)
     for tbl in tables:
@@ -734,32 +865,35 @@ def db_cmd(
             console.print(f"[red]Unknown table:[/red] {tbl}  (choose from {', '.join(DB_TABLES)})")
             raise typer.Exit(code=1)
 
-    all_data: dict[str, list[dict]] = {}
-    for tbl in tables:
-        all_data[tbl] = dump_table(tbl)
-
     if as_json:
-        console.print_json(json.dumps(all_data, default=str))
+        all_data = {tbl: dump_table(tbl) for tbl in tables}
+        console.print_json(json_text(all_data))
         raise typer.Exit(code=0)
 
+    total_rows = 0
     for tbl in tables:
-        rows = all_data[tbl]
-        cols = _TABLE_COLUMNS.get(tbl, list(rows[0].keys()) if rows else ["(empty)"])
-        rt = Table(title=f"{tbl} ({len(rows)})", show_lines=False, pad_edge=True)
+        cols = _TABLE_COLUMNS[tbl]
+        rt = Table(show_lines=False, pad_edge=True)
         for col in cols:
             rt.add_column(col, overflow="fold")
-        for row in rows:
+        count = 0
+        for row in dump_table_iter(tbl, cols):
             rt.add_row(*(str(row.get(c, "")) for c in cols))
+            count += 1
+        rt.title = f"{tbl} ({count})"
+        total_rows += count
         console.print(rt)
         console.print()
 
-    if not any(all_data.values()):
+    if not total_rows:
         console.print("[dim]All tables are empty.[/dim]")
 
 
 @app.command("help")
 def help_cmd() -> None:
     """Show a summary of j2pr and all available commands."""
+    from rich.table import Table
+
     console.print()
     console.print("[bold cyan]j2pr[/bold cyan] — Turn eligible Jira issues into Draft Pull Requests using a Cursor headless agent.")
     console.print()
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import re
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import yaml
 from pydantic import BaseModel, Field, ValidationError
 
+from .util import expand_path
+
 DEFAULT_CONFIG_PATH = Path("~/.j2pr/config.yaml").expanduser()
 
+# Bump whenever a config model changes shape; cached configs written under
+# another version are revalidated instead of trusted.
+CONFIG_SCHEMA_VERSION = 1
+
 ENV_PATTERN = re.compile(r"\$\{([A-Z0-9_]+)\}")
 
 
@@ -25,6 +32,8 @@ class JiraConfig(BaseModel):
     label_running: Optional[str] = None
     label_done: Optional[str] = None
     label_failed: Optional[str] = None
+    # Requests per second to Jira; 0 relies on the x-ratelimit-* response headers alone.
+    rate_limit: float = 0.0
 
 
 class GitHubConfig(BaseModel):
@@ -113,6 +122,7 @@ class CursorConfig(BaseModel):
     model: str = ""
     timeout_minutes: int = 45
     prompt_template_path: str = ""
+    prompt_flag: str = "--print"
 
 
 class SessionCaptureConfig(BaseModel):
@@ -121,6 +131,7 @@ class SessionCaptureConfig(BaseModel):
     include_config: bool = True
     include_env: bool = True
     retention_days: int = 0
+    verbose_manifest: bool = False
     redact_patterns: List[str] = Field(
         default_factory=lambda: ["token", "password", "secret", "api_key"]
     )
@@ -133,6 +144,10 @@ class AppConfig(BaseModel):
     guardrails: GuardrailsConfig
     cursor: CursorConfig
     session_capture: SessionCaptureConfig = Field(default_factory=SessionCaptureConfig)
+    schema_version: int = CONFIG_SCHEMA_VERSION
+
+
+_REQUIRED_SECTIONS = tuple(name for name, field in AppConfig.model_fields.items() if field.is_required())
 
 
 @dataclass
@@ -141,13 +156,13 @@ class ConfigResult:
     errors: List[str]
 
 
+def _env_value(match: re.Match[str]) -> str:
+    return os.environ.get(match.group(1), "")
+
+
 def _interpolate_env(value: Any) -> Any:
     if isinstance(value, str):
-        def replace(match: re.Match[str]) -> str:
-            env_key = match.group(1)
-            return os.environ.get(env_key, "")
-
-        return ENV_PATTERN.sub(replace, value)
+        return ENV_PATTERN.sub(_env_value, value) if "${" in value else value
     if isinstance(value, list):
         return [_interpolate_env(v) for v in value]
     if isinstance(value, dict):
@@ -155,17 +170,136 @@ def _interpolate_env(value: Any) -> Any:
     return value
 
 
-def load_config(path: Optional[str] = None) -> ConfigResult:
-    config_path = Path(path).expanduser() if path else DEFAULT_CONFIG_PATH
+def _construct(model: type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+    """``model_construct`` that also builds nested models from their dicts."""
+    values: Dict[str, Any] = {}
+    for name, value in data.items():
+        field = model.model_fields.get(name)
+        annotation = field.annotation if field else None
+        if isinstance(value, dict) and isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            value = _construct(annotation, value)
+        values[name] = value
+    return model.model_construct(**values)
+
+
+def config_cache_path(config_path: Path) -> Path:
+    return config_path.with_suffix(".cache.json")
+
+
+def _read_cache(cache_path: Path, config_path: Path, mtime_ns: int, raw_bytes: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        cached = json.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if cached.get("path") != str(config_path) or cached.get("mtime_ns") != mtime_ns:
+        return None
+    if cached.get("sha256") != hashlib.sha256(raw_bytes).hexdigest():
+        return None
+    data = cached.get("data")
+    if not isinstance(data, dict) or data.get("schema_version") != CONFIG_SCHEMA_VERSION:
+        return None
+    return data
+
+
+def _write_cache(cache_path: Path, config_path: Path, mtime_ns: int, raw_bytes: bytes, data: Dict[str, Any]) -> None:
+    payload = {
+        "path": str(config_path),
+        "mtime_ns": mtime_ns,
+        "sha256": hashlib.sha256(raw_bytes).hexdigest(),
+        "data": data,
+    }
+    tmp = cache_path.with_name(f".{cache_path.name}.tmp")
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+        os.replace(tmp, cache_path)
+    except OSError:
+        pass
+
+
+def _validation_forced() -> bool:
+    return os.environ.get("J2PR_VALIDATE_CONFIG", "").strip().lower() in ("1", "true", "yes")
+
+
+def load_config_fast(path: Optional[str] = None) -> Optional[AppConfig]:
+    """Return the cached config without validating it, or None on a cache miss.
+
+    Set J2PR_VALIDATE_CONFIG=1 (e.g. in CI) to always take the validating path.
+    """
+    if _validation_forced():
+        return None
+    config_path = expand_path(path) if path else DEFAULT_CONFIG_PATH
+    try:
+        raw_bytes = config_path.read_bytes()
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
+        return None
+    # The cache holds the validated config *before* env interpolation, so
+    # secrets pulled from the environment never reach disk and env changes
+    # still apply. Interpolation only substitutes string values (never keys),
+    # exactly as on the uncached path, so the cached data stays valid once
+    # interpolated.
+    cached = _read_cache(config_cache_path(config_path), config_path, mtime_ns, raw_bytes)
+    if cached is None:
+        return None
+    return _construct(AppConfig, _interpolate_env(cached))
+
+
+def check_config_shape(path: Optional[str] = None) -> List[str]:
+    """Cheap sanity check: the YAML parses and every required section exists.
+
+    No model validation runs; a warm cache counts as valid.
+    """
+    config_path = expand_path(path) if path else DEFAULT_CONFIG_PATH
+    if not config_path.exists():
+        return [f"Config not found at {config_path}"]
+    if load_config_fast(path) is not None:
+        return []
+
+    import yaml
+
+    try:
+        raw = yaml.safe_load(config_path.read_bytes()) or {}
+    except yaml.YAMLError as exc:
+        return [f"Invalid YAML: {exc}"]
+    if not isinstance(raw, dict):
+        return ["Config must be a mapping"]
+    return [f"Missing section: {name}" for name in _REQUIRED_SECTIONS if name not in raw]
+
+
+def load_config(path: Optional[str] = None, strict: bool = False) -> ConfigResult:
+    """Load and validate the config; *strict* ignores the cache and always validates."""
+    fast = None if strict else load_config_fast(path)
+    if fast is not None:
+        return ConfigResult(fast, [])
+
+    config_path = expand_path(path) if path else DEFAULT_CONFIG_PATH
     if not config_path.exists():
         return ConfigResult(None, [f"Config not found at {config_path}"])
 
-    raw = yaml.safe_load(config_path.read_text()) or {}
+    raw_bytes = config_path.read_bytes()
+    mtime_ns = config_path.stat().st_mtime_ns
+
+    import yaml
+
+    raw = yaml.safe_load(raw_bytes) or {}
     interpolated = _interpolate_env(raw)
     try:
-        return ConfigResult(AppConfig.model_validate(interpolated), [])
+        config = AppConfig.model_validate(interpolated)
     except ValidationError as exc:
         return ConfigResult(None, [str(err) for err in exc.errors()])
+    try:
+        template = AppConfig.model_validate(raw)
+    except ValidationError:
+        # A placeholder sits in a non-string field; only the interpolated
+        # form validates, so this config is not cacheable.
+        pass
+    else:
+        data = template.model_dump(mode="json")
+        data["schema_version"] = CONFIG_SCHEMA_VERSION
+        _write_cache(config_cache_path(config_path), config_path, mtime_ns, raw_bytes, data)
+    return ConfigResult(config, [])
 
 
 def config_path_from_env() -> Optional[str]:
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
-import json
+import mmap
+import os
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Union
+
+from .util import intern_str, json_loads
+
+FOOTER_PREFIX = "J2PR_RESULT:"
+_FOOTER_PREFIX_BYTES = FOOTER_PREFIX.encode()
 
 
 @dataclass
@@ -20,19 +27,48 @@ class AgentFooter:
 
 
 def parse_footer(line: str) -> Optional[AgentFooter]:
-    if not line.startswith("J2PR_RESULT:"):
+    if not line.startswith(FOOTER_PREFIX):
         return None
-    raw = line.replace("J2PR_RESULT:", "", 1).strip()
-    data = json.loads(raw)
+    data = json_loads(line[len(FOOTER_PREFIX) :].strip())
     return AgentFooter(
-        decision=data.get("decision", ""),
+        decision=intern_str(data.get("decision", "")),
         summary=data.get("summary", ""),
         changes=data.get("changes", []),
         tests=data.get("tests", {}),
         risk=data.get("risk", ""),
-        repo=data.get("repo", ""),
-        branch=data.get("branch", ""),
+        repo=intern_str(data.get("repo", "")),
+        branch=intern_str(data.get("branch", "")),
         commit_message=data.get("commit_message", ""),
         notes_for_reviewer=data.get("notes_for_reviewer", ""),
         blocking_reason=data.get("blocking_reason", ""),
     )
+
+
+def find_footer(data: Union[bytes, bytearray, mmap.mmap]) -> Optional[AgentFooter]:
+    """Return the last footer line in a transcript buffer.
+
+    Scans backwards with ``rfind`` and decodes only the footer line, so large
+    transcripts are never split into lines. A prefix that does not start a
+    line (ignoring indentation) is skipped, matching ``parse_footer`` on the
+    stripped line.
+    """
+    end = len(data)
+    while True:
+        idx = data.rfind(_FOOTER_PREFIX_BYTES, 0, end)
+        if idx == -1:
+            return None
+        line_start = data.rfind(b"\n", 0, idx) + 1
+        if not data[line_start:idx].strip():
+            line_end = data.find(b"\n", idx)
+            line = data[idx : line_end if line_end != -1 else len(data)]
+            return parse_footer(line.decode("utf-8", errors="replace").strip())
+        end = idx
+
+
+def read_footer(path: Path) -> Optional[AgentFooter]:
+    """Memory-map the transcript at *path* and return its last footer."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return find_footer(mm)
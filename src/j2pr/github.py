@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
-import requests
+from .util import json_loads, run_command
 
-from .util import run_command
+if TYPE_CHECKING:
+    import requests
 
 
 @dataclass
@@ -16,6 +18,15 @@ class PRInfo:
     number: int
 
 
+def _session() -> requests.Session:
+    # The HTTP stack is only loaded when a REST fallback is actually used;
+    # the gh CLI path never imports requests.
+    from .http import get_github_session
+
+    return get_github_session()
+
+
+@lru_cache(maxsize=1)
 def _gh_available() -> bool:
     result = run_command(["gh", "--version"])
     return result.returncode == 0
@@ -28,7 +39,7 @@ def find_pr_with_gh(branch: str, cwd: Optional[Path] = None) -> Optional[str]:
     )
     if result.returncode != 0:
         return None
-    data = json.loads(result.stdout or "[]")
+    data = json_loads(result.stdout_bytes or b"[]")
     if data:
         return data[0].get("url")
     return None
@@ -41,7 +52,7 @@ def find_pr_by_jira_with_gh(jira_key: str, cwd: Optional[Path] = None) -> Option
     )
     if result.returncode != 0:
         return None
-    data = json.loads(result.stdout or "[]")
+    data = json_loads(result.stdout_bytes or b"[]")
     if data:
         return data[0].get("url")
     return None
@@ -70,11 +81,13 @@ def create_pr_with_gh(
     return result.stdout.strip().splitlines()[-1]
 
 
-def find_pr_with_rest(owner: str, repo: str, branch: str, token: str) -> Optional[str]:
+def find_pr_with_rest(
+    owner: str, repo: str, branch: str, token: str, session: Optional[requests.Session] = None
+) -> Optional[str]:
     headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
     query = f"repo:{owner}/{repo}+type:pr+head:{owner}:{branch}+state:open"
     url = f"https://api.github.com/search/issues?q={query}"
-    resp = requests.get(url, headers=headers, timeout=30)
+    resp = (session or _session()).get(url, headers=headers, timeout=30)
     resp.raise_for_status()
     data = resp.json()
     items = data.get("items", [])
@@ -83,11 +96,13 @@ def find_pr_with_rest(owner: str, repo: str, branch: str, token: str) -> Optiona
     return None
 
 
-def find_pr_by_jira_with_rest(owner: str, repo: str, jira_key: str, token: str) -> Optional[str]:
+def find_pr_by_jira_with_rest(
+    owner: str, repo: str, jira_key: str, token: str, session: Optional[requests.Session] = None
+) -> Optional[str]:
     headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
     query = f"repo:{owner}/{repo}+type:pr+state:open+{jira_key}"
     url = f"https://api.github.com/search/issues?q={query}"
-    resp = requests.get(url, headers=headers, timeout=30)
+    resp = (session or _session()).get(url, headers=headers, timeout=30)
     resp.raise_for_status()
     data = resp.json()
     items = data.get("items", [])
@@ -105,15 +120,39 @@ def create_pr_with_rest(
     base: str,
     head: str,
     draft: bool,
+    session: Optional[requests.Session] = None,
 ) -> str:
     headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
     url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
     payload = {"title": title, "body": body, "base": base, "head": head, "draft": draft}
-    resp = requests.post(url, json=payload, headers=headers, timeout=30)
+    resp = (session or _session()).post(url, json=payload, headers=headers, timeout=30)
     resp.raise_for_status()
     return resp.json()["html_url"]
 
 
+def first_pr_hit(lookups: Dict[str, Callable[[], Optional[str]]]) -> Tuple[Optional[str], Optional[str]]:
+    """Run PR lookups concurrently and return ``(url, source)`` by priority.
+
+    *lookups* maps a source label to a zero-argument lookup, in priority
+    order. All lookups start at once, but results are taken in that order: a
+    lookup's hit (or error) is only used once every earlier lookup has come
+    back empty, so the answer never depends on which request is faster.
+    Lookups still in flight after a decision are abandoned.
+    """
+    if not lookups:
+        return None, None
+    pool = ThreadPoolExecutor(max_workers=len(lookups))
+    futures = [(source, pool.submit(lookup)) for source, lookup in lookups.items()]
+    try:
+        for source, future in futures:
+            url = future.result()
+            if url:
+                return url, source
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return None, None
+
+
 def ensure_gh() -> None:
     if not _gh_available():
         raise RuntimeError("gh CLI not found; disable use_gh_cli or install gh")
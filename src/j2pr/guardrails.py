@@ -1,31 +1,86 @@
 from __future__ import annotations
 
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, List, Sequence, Tuple
 
-from .repo import diff_name_only, diff_numstat
+from .repo import diff_numstat_named
+
+_NEVER = re.compile(r"(?!)")
+
+
+def _component_regex(component: str) -> str:
+    """Translate one glob path component; wildcards never cross a ``/``."""
+    out = []
+    i, n = 0, len(component)
+    while i < n:
+        c = component[i]
+        i += 1
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i
+            if j < n and component[j] == "!":
+                j += 1
+            if j < n and component[j] == "]":
+                j += 1
+            while j < n and component[j] != "]":
+                j += 1
+            if j >= n:
+                out.append("\\[")
+            else:
+                body = component[i:j].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                elif body.startswith("^"):
+                    body = "\\" + body
+                out.append(f"(?!/)[{body}]")
+                i = j + 1
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+def _glob_regex(pattern: str) -> str:
+    # Same anchoring as PurePath.match: relative patterns match from the right
+    # on whole components, absolute ones must match the whole path. A `**`
+    # component matches one or more components, a superset of PurePath.match,
+    # which treats it like `*`.
+    components = [c for c in pattern.split("/") if c not in ("", ".")]
+    body = "/".join("[^/]+(?:/[^/]+)*" if c == "**" else _component_regex(c) for c in components)
+    prefix = "^/" if pattern.startswith("/") else "(?:^|/)"
+    return f"{prefix}{body}$"
+
+
+@lru_cache(maxsize=None)
+def _compile_deny_globs(patterns: Tuple[str, ...]) -> re.Pattern[str]:
+    """Compile every deny glob into one alternation, once per pattern set."""
+    regexes = [f"(?:{_glob_regex(p)})" for p in patterns if p.strip("/.")]
+    return re.compile("|".join(regexes)) if regexes else _NEVER
 
 
 def matches_deny_glob(path: str, deny_globs: List[str]) -> bool:
-    path_obj = Path(path)
-    for pattern in deny_globs:
-        if path_obj.match(pattern):
-            return True
-    return False
+    return _compile_deny_globs(tuple(deny_globs)).search(path) is not None
 
 
-def enforce_deny_globs(cwd: Path, deny_globs: List[str]) -> Tuple[bool, List[str]]:
-    blocked = []
-    for name in diff_name_only(cwd):
-        if matches_deny_glob(name, deny_globs):
-            blocked.append(name)
+def check_deny_globs(names: Iterable[str], deny_globs: List[str]) -> Tuple[bool, List[str]]:
+    pattern = _compile_deny_globs(tuple(deny_globs))
+    blocked = [name for name in names if pattern.search(name)]
     return (len(blocked) == 0), blocked
 
 
-def enforce_diff_limits(cwd: Path, max_files: int, max_lines: int) -> Tuple[bool, int, int]:
-    files = diff_name_only(cwd)
-    numstat = diff_numstat(cwd)
+def check_diff_limits(numstat: Sequence[Tuple[int, int, str]], max_files: int, max_lines: int) -> Tuple[bool, int, int]:
+    files = len(numstat)
     lines = sum(added + removed for added, removed, _ in numstat)
-    if len(files) > max_files or lines > max_lines:
-        return False, len(files), lines
-    return True, len(files), lines
+    return files <= max_files and lines <= max_lines, files, lines
+
+
+def enforce_deny_globs(cwd: Path, deny_globs: List[str]) -> Tuple[bool, List[str]]:
+    return check_deny_globs((name for _, _, name in diff_numstat_named(cwd)), deny_globs)
+
+
+def enforce_diff_limits(cwd: Path, max_files: int, max_lines: int) -> Tuple[bool, int, int]:
+    return check_diff_limits(diff_numstat_named(cwd), max_files, max_lines)
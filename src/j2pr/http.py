@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+POOL_CONNECTIONS = 20
+POOL_MAXSIZE = 100
+
+# 429 handling: how often to retry, the fallback backoff when the server sends
+# no Retry-After, and the longest we are willing to wait for one window.
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 1.0
+MAX_RATE_LIMIT_WAIT = 60.0
+
+_SESSIONS: Dict[str, "RateLimitedSession"] = {}
+_LOCK = threading.Lock()
+
+
+def _retry() -> Retry:
+    # urllib3 only retries idempotent methods by default, so POSTs (search,
+    # comment, PR create) are never replayed. 429s are handled by
+    # RateLimitedSession, which can honour the server's rate-limit headers.
+    return Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    )
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``rate`` of 0 means unlimited.
+
+    Besides the steady rate, ``pause`` blocks every caller until a point in
+    time, which is how Retry-After and exhausted-quota headers are applied.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: float = 1.0) -> None:
+        self._rate = rate
+        self._burst = max(burst, 1.0)
+        self._tokens = self._burst
+        self._stamp = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def set_rate(self, rate: float, burst: Optional[float] = None) -> None:
+        with self._lock:
+            self._rate = max(rate, 0.0)
+            if burst is not None:
+                self._burst = max(burst, 1.0)
+                self._tokens = min(self._tokens, self._burst)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + min(seconds, MAX_RATE_LIMIT_WAIT))
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._paused_until - now, 0.0)
+            if self._rate > 0:
+                self._tokens = min(self._burst, self._tokens + (now - self._stamp) * self._rate)
+                self._stamp = now
+                # Reserve a token now (possibly going negative) so concurrent
+                # callers queue up behind each other instead of all waking at once.
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self._rate)
+        if wait > 0:
+            time.sleep(wait)
+
+
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _observe_rate_limit(bucket: TokenBucket, resp: requests.Response) -> None:
+    """Adjust *bucket* from the rate-limit headers Jira and GitHub send."""
+    headers = resp.headers
+    try:
+        # Jira Cloud: a bucket refilled with `fillrate` tokens every `interval` seconds.
+        fillrate = headers.get("x-ratelimit-fillrate")
+        interval = headers.get("x-ratelimit-interval-seconds")
+        if fillrate and interval and float(interval) > 0:
+            # Headers only ever tighten the pace, never lift a configured cap.
+            rate = float(fillrate) / float(interval)
+            if bucket.rate == 0 or rate < bucket.rate:
+                bucket.set_rate(rate, burst=float(headers.get("x-ratelimit-limit") or 1))
+        # GitHub: quota exhausted until an epoch-seconds reset.
+        remaining = headers.get("x-ratelimit-remaining")
+        reset = headers.get("x-ratelimit-reset")
+        if remaining == "0" and reset and reset.isdigit():
+            bucket.pause(int(reset) - time.time())
+    except ValueError:
+        pass
+
+
+class RateLimitedSession(requests.Session):
+    """Session that paces requests and retries 429s using the server's headers.
+
+    A 429 means the request was not processed, so it is safe to replay for
+    every method, including POST.
+    """
+
+    def __init__(self, rate: float = 0.0, retries: int = RATE_LIMIT_RETRIES) -> None:
+        super().__init__()
+        self.bucket = TokenBucket(rate)
+        self.rate_limit_retries = retries
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            resp = super().request(method, url, *args, **kwargs)
+            _observe_rate_limit(self.bucket, resp)
+            if resp.status_code != 429 or attempt >= self.rate_limit_retries:
+                return resp
+            delay = _retry_after(resp)
+            self.bucket.pause(delay if delay is not None else RATE_LIMIT_BACKOFF * 2 ** attempt)
+            resp.close()
+            attempt += 1
+
+
+def new_session(rate: float = 0.0) -> RateLimitedSession:
+    """Session with pooled keep-alive connections and retries for transient errors."""
+    session = RateLimitedSession(rate)
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=_retry())
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _shared(name: str) -> RateLimitedSession:
+    with _LOCK:
+        session = _SESSIONS.get(name)
+        if session is None:
+            session = _SESSIONS[name] = new_session()
+        return session
+
+
+def get_jira_session() -> RateLimitedSession:
+    return _shared("jira")
+
+
+def get_github_session() -> RateLimitedSession:
+    return _shared("github")
+
+
+def set_rate_limit(name: str, rate: float) -> None:
+    """Cap the shared *name* session at *rate* requests per second (0 = header-driven only)."""
+    _shared(name).bucket.set_rate(rate)
+
+
+def close_sessions(name: Optional[str] = None) -> None:
+    with _LOCK:
+        names = [name] if name else list(_SESSIONS)
+        for key in names:
+            session = _SESSIONS.pop(key, None)
+            if session is not None:
+                session.close()
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import requests
 
+from .http import get_jira_session
+
+# Jira Cloud caps maxResults (typically at 100) and reports what it used;
+# asking for more just lets Server/DC return bigger pages.
+SEARCH_PAGE_SIZE = 500
+# Concurrent page fetches; all share the session's rate limiter.
+SEARCH_WORKERS = 4
+
 
 @dataclass
 class JiraIssue:
@@ -24,31 +34,66 @@ def search_issues(
     jql: str,
     fields: List[str],
     limit: int = 20,
+    session: Optional[requests.Session] = None,
 ) -> List[JiraIssue]:
+    """Return up to *limit* issues matching *jql*, fetching pages as needed.
+
+    The legacy /search endpoint reports ``total``, so its remaining pages are
+    fetched concurrently once the first page arrives. /search/jql pages by
+    ``nextPageToken`` and has to be walked in order.
+    """
+    http = session or get_jira_session()
     base = base_url.rstrip("/")
     headers = {"Accept": "application/json"}
     auth = _auth(email, api_token)
-    payload = {"jql": jql, "maxResults": limit, "fields": fields}
-
-    # Some Jira instances expose /search/jql; fall back to /search if needed.
     new_url = f"{base}/rest/api/{api_version}/search/jql"
-    resp = requests.post(new_url, json=payload, auth=auth, headers=headers, timeout=30)
+    legacy_url = f"{base}/rest/api/{api_version}/search"
+    # Which endpoint answered the first page; later pages go straight to it.
+    mode = "jql"
 
-    if resp.status_code in {404, 405, 410}:
-        # Server / DC may not have /search/jql — fall back to legacy.
-        legacy_url = f"{base}/rest/api/{api_version}/search"
-        resp = requests.post(legacy_url, json=payload, auth=auth, headers=headers, timeout=30)
-        if resp.status_code in {405, 410}:
-            params = {"jql": jql, "maxResults": limit, "fields": ",".join(fields)}
-            resp = requests.get(legacy_url, params=params, auth=auth, headers=headers, timeout=30)
+    def fetch(max_results: int, start_at: int = 0, token: Optional[str] = None) -> Dict[str, Any]:
+        nonlocal mode
+        payload: Dict[str, Any] = {"jql": jql, "maxResults": max_results, "fields": fields}
+        resp = None
+        if mode == "jql":
+            if token:
+                payload["nextPageToken"] = token
+            resp = http.post(new_url, json=payload, auth=auth, headers=headers, timeout=30)
+            # Server / DC may not have /search/jql — fall back to legacy.
+            if resp.status_code in {404, 405, 410}:
+                mode = "legacy_post"
+                resp = None
+        if mode != "jql":
+            payload["startAt"] = start_at
+        if mode == "legacy_post":
+            resp = http.post(legacy_url, json=payload, auth=auth, headers=headers, timeout=30)
+            if resp.status_code in {405, 410}:
+                mode = "legacy_get"
+                resp = None
+        if mode == "legacy_get":
+            params = {"jql": jql, "startAt": start_at, "maxResults": max_results, "fields": ",".join(fields)}
+            resp = http.get(legacy_url, params=params, auth=auth, headers=headers, timeout=30)
+        if resp.status_code >= 400:
+            raise RuntimeError(_format_error("Jira search failed", resp))
+        return resp.json()
 
-    if resp.status_code >= 400:
-        raise RuntimeError(_format_error("Jira search failed", resp))
-    data = resp.json()
-    issues = []
-    for issue in data.get("issues", []):
-        issues.append(JiraIssue(issue["key"], issue.get("fields", {})))
-    return issues
+    data = fetch(min(limit, SEARCH_PAGE_SIZE))
+    raw_issues = list(data.get("issues", []))
+    if mode == "jql":
+        while len(raw_issues) < limit and data.get("nextPageToken") and not data.get("isLast"):
+            data = fetch(min(limit - len(raw_issues), SEARCH_PAGE_SIZE), token=data["nextPageToken"])
+            raw_issues.extend(data.get("issues", []))
+    else:
+        # The server may cap maxResults below what we asked for; page by what it used.
+        page = data.get("maxResults") or len(raw_issues)
+        wanted = min(limit, data.get("total", 0))
+        offsets = list(range(len(raw_issues), wanted, page)) if page else []
+        if offsets:
+            with ThreadPoolExecutor(max_workers=min(SEARCH_WORKERS, len(offsets))) as pool:
+                pages = pool.map(lambda start: fetch(min(page, wanted - start), start_at=start), offsets)
+                for page_data in pages:
+                    raw_issues.extend(page_data.get("issues", []))
+    return [JiraIssue(issue["key"], issue.get("fields", {})) for issue in raw_issues[:limit]]
 
 
 def add_comment(
@@ -58,14 +103,55 @@ def add_comment(
     api_version: int,
     issue_key: str,
     comment: str,
+    session: Optional[requests.Session] = None,
 ) -> None:
+    http = session or get_jira_session()
     url = f"{base_url.rstrip('/')}/rest/api/{api_version}/issue/{issue_key}/comment"
     payload = {"body": comment}
-    resp = requests.post(url, json=payload, auth=_auth(email, api_token), timeout=30)
+    resp = http.post(url, json=payload, auth=_auth(email, api_token), timeout=30)
     if resp.status_code >= 400:
         raise RuntimeError(_format_error("Jira add comment failed", resp))
 
 
+async def add_comments_async(
+    base_url: str,
+    email: str,
+    api_token: str,
+    api_version: int,
+    comments: Sequence[Tuple[str, str]],
+    max_concurrency: int = 10,
+    session: Optional[requests.Session] = None,
+) -> List[Optional[BaseException]]:
+    """Post ``(issue_key, comment)`` pairs concurrently on the shared session.
+
+    Results are in input order: None for a posted comment, otherwise the
+    exception, so one failed ticket does not hide the rest.
+    """
+    http = session or get_jira_session()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _bounded(issue_key: str, comment: str) -> None:
+        async with semaphore:
+            await asyncio.to_thread(add_comment, base_url, email, api_token, api_version, issue_key, comment, http)
+
+    results = await asyncio.gather(*(_bounded(key, comment) for key, comment in comments), return_exceptions=True)
+    return [result if isinstance(result, BaseException) else None for result in results]
+
+
+def add_comments(
+    base_url: str,
+    email: str,
+    api_token: str,
+    api_version: int,
+    comments: Sequence[Tuple[str, str]],
+    max_concurrency: int = 10,
+    session: Optional[requests.Session] = None,
+) -> List[Optional[BaseException]]:
+    return asyncio.run(
+        add_comments_async(base_url, email, api_token, api_version, comments, max_concurrency, session)
+    )
+
+
 def _format_error(prefix: str, resp: requests.Response) -> str:
     text = resp.text.strip()
     if len(text) > 500:
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
-import json
+import atexit
 import logging
+import queue
+import re
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+from .util import json_text
 
 LOG_PATH = Path("~/.j2pr/j2pr.log").expanduser()
 
+# Keys whose values are never written to the log.
+_SECRET_RE = re.compile(r"token|password|secret|api[_-]?key", re.IGNORECASE)
+
+# File writes happen on the listener's thread so log calls never block on disk.
+_LISTENER: Optional[QueueListener] = None
+
 
 def setup_logger() -> logging.Logger:
+    global _LISTENER
     LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
     logger = logging.getLogger("j2pr")
     if logger.handlers:
@@ -17,19 +29,35 @@ def setup_logger() -> logging.Logger:
     handler = logging.FileHandler(LOG_PATH)
     formatter = logging.Formatter("%(asctime)s %(levelname)s %(message)s")
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(records))
+    _LISTENER = QueueListener(records, handler)
+    _LISTENER.start()
     return logger
 
 
+def shutdown_logger() -> None:
+    """Flush queued records to the log file and detach the j2pr handlers."""
+    global _LISTENER
+    if _LISTENER is None:
+        return
+    _LISTENER.stop()
+    for handler in _LISTENER.handlers:
+        handler.close()
+    _LISTENER = None
+    logger = logging.getLogger("j2pr")
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+
+atexit.register(shutdown_logger)
+
+
 def redact_secrets(payload: Dict[str, Any]) -> Dict[str, Any]:
-    redacted = {}
-    for key, value in payload.items():
-        if "token" in key.lower() or "password" in key.lower():
-            redacted[key] = "***"
-        else:
-            redacted[key] = value
-    return redacted
+    return {key: "***" if _SECRET_RE.search(key) else value for key, value in payload.items()}
 
 
 def log_event(logger: logging.Logger, event: str, data: Dict[str, Any]) -> None:
-    logger.info("%s %s", event, json.dumps(redact_secrets(data), default=str))
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info("%s %s", event, json_text(redact_secrets(data)))
@@ -5,34 +5,60 @@ import os
 import re
 import subprocess
 import time
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from .config import RepoInferenceConfig
+from .util import expand_path
+
+# File reads for content scoring run on a small pool, a bounded window ahead
+# of the scorer so budgets and timeouts cut off at most a few extra reads.
+_READ_WORKERS = 8
+_READ_AHEAD = 2 * _READ_WORKERS
+
+
+@lru_cache(maxsize=32)
+def _compile_mapping(items: Tuple[Tuple[str, str], ...]) -> Tuple[Tuple[str, Optional[str], str], ...]:
+    """Parse mapping keys once into ordered ``(field, expected, repo)`` rules.
+
+    ``expected`` is None for a bare field key, which matches on presence.
+    """
+    rules = []
+    for key, repo in items:
+        if ":" in key or "=" in key:
+            sep = ":" if ":" in key else "="
+            field, expected = key.split(sep, 1)
+            rules.append((field, expected, repo))
+        else:
+            rules.append((key, None, repo))
+    return tuple(rules)
 
 
 def map_repo(
     jira_fields: Dict[str, object],
     repo_mapping: Dict[str, str],
 ) -> Optional[str]:
-    for key, repo in repo_mapping.items():
-        if ":" in key or "=" in key:
-            sep = ":" if ":" in key else "="
-            field, expected = key.split(sep, 1)
-            value = jira_fields.get(field)
-            if isinstance(value, list):
-                if expected in [str(v) for v in value]:
-                    return repo
-            elif value is not None and str(value) == expected:
+    for field, expected, repo in _compile_mapping(tuple(repo_mapping.items())):
+        if expected is None:
+            if field in jira_fields:
                 return repo
-        elif key in jira_fields:
+            continue
+        value = jira_fields.get(field)
+        if isinstance(value, list):
+            if any(str(v) == expected for v in value):
+                return repo
+        elif value is not None and str(value) == expected:
             return repo
     return None
 
 
+_NAME_SPLIT_RE = re.compile(r"[^A-Za-z0-9]+")
 _TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_\-./]{2,}")
-_STOPWORDS = {
+_STOPWORDS = frozenset({
     "the",
     "and",
     "with",
@@ -87,7 +113,7 @@ _STOPWORDS = {
     "n/a",
     "none",
     "todo",
-}
+})
 
 
 def infer_repo_from_issue(
@@ -143,9 +169,9 @@ def _extract_ticket_text(jira_fields: Dict[str, object]) -> str:
 def _extract_tokens(text: str, max_tokens: int) -> List[str]:
     if not text:
         return []
-    raw = [token.lower() for token in _TOKEN_RE.findall(text)]
-    filtered = [token for token in raw if token not in _STOPWORDS and len(token) >= 3]
-    counts = Counter(filtered)
+    # Lowercase once up front so findall (entirely in C) yields final tokens;
+    # _TOKEN_RE already guarantees at least three characters.
+    counts = Counter(token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOPWORDS)
     return [token for token, _ in counts.most_common(max_tokens)]
 
 
@@ -154,7 +180,7 @@ def _discover_repos(
     repo_allowlist: Sequence[str],
     max_repos: int,
 ) -> List[Path]:
-    root = Path(root_dir).expanduser()
+    root = expand_path(root_dir)
     repos: List[Path] = []
     if repo_allowlist:
         for repo in repo_allowlist:
@@ -163,25 +189,34 @@ def _discover_repos(
                 repos.append(repo_path)
         return repos
 
-    if not root.exists():
+    try:
+        root_mtime = root.stat().st_mtime_ns
+    except OSError:
         return []
-    for entry in root.iterdir():
-        if entry.is_dir() and (entry / ".git").exists():
+    for entry in _subdirs(str(root), root_mtime):
+        if os.path.exists(os.path.join(entry, ".git")):
             repos.append(entry)
             if max_repos > 0 and len(repos) >= max_repos:
                 break
     return repos
 
 
+@lru_cache(maxsize=32)
+def _subdirs(root: str, mtime_ns: int) -> Tuple[Path, ...]:
+    # Keyed on the root's mtime, which changes whenever an entry is added,
+    # removed or renamed. The `.git` check stays live in the caller since
+    # `git init` inside an existing directory does not touch the root.
+    # DirEntry.is_dir answers from the readdir d_type, with no stat except
+    # for symlinks, which are still followed so linked repos are found.
+    with os.scandir(root) as entries:
+        return tuple(Path(entry.path) for entry in entries if entry.is_dir())
+
+
 def _score_repo_name(tokens: Iterable[str], repo_name: str) -> float:
-    name_tokens = {token for token in re.split(r"[^A-Za-z0-9]+", repo_name.lower()) if token}
-    if not name_tokens:
-        return 0.0
-    score = 0.0
-    for token in tokens:
-        if token in name_tokens:
-            score += 2.0
-    return score
+    name_tokens = set(_NAME_SPLIT_RE.split(repo_name.lower()))
+    name_tokens.discard("")
+    # Tokens are unique (see _extract_tokens), so the intersection counts each hit once.
+    return 2.0 * len(name_tokens.intersection(tokens))
 
 
 def _score_repo_content(
@@ -191,99 +226,175 @@ def _score_repo_content(
     start: float,
 ) -> float:
     score = 0.0
-    matched: Set[str] = set()
     files_checked = 0
-    total_checked = 0
-
-    for path in _iter_repo_files(repo_path, inference):
-        if _timed_out(start, inference.max_seconds):
-            break
-        if files_checked >= inference.max_files_per_repo:
-            break
-        if total_checked >= inference.max_total_files:
-            break
-        total_checked += 1
-
-        rel_path = str(path.relative_to(repo_path)).lower()
-        for token in tokens:
-            if token in matched:
-                continue
-            if token in rel_path:
-                matched.add(token)
-                score += 1.0
-
+    # Tokens still unmatched, each scored at most once. They are ASCII (see
+    # _TOKEN_RE), so they can be matched against the raw file bytes
+    # lowercased with bytes.lower, with no decode per file.
+    remaining = [(token, token.encode("ascii")) for token in tokens]
+    paths = islice(_iter_repo_files(repo_path, inference), max(inference.max_total_files, 0))
+
+    # Reads run ahead on a small pool while scoring consumes them in walk
+    # order: a token found in a path scores less than in content, so the
+    # order decides the score and must stay deterministic.
+    with ThreadPoolExecutor(max_workers=_READ_WORKERS) as pool:
+        pending: Deque[Tuple[Path, Future]] = deque()
+
+        def fill() -> None:
+            while len(pending) < _READ_AHEAD:
+                path = next(paths, None)
+                if path is None:
+                    return
+                pending.append((path, pool.submit(_read_text_file, path, inference.max_bytes_per_file)))
+
+        fill()
         try:
-            content = _read_text_file(path, inference.max_bytes_per_file)
-        except OSError:
-            continue
-        if content is None:
-            continue
-
-        content_lower = content.lower()
-        for token in tokens:
-            if token in matched:
-                continue
-            if token in content_lower:
-                matched.add(token)
-                score += 2.0
-        files_checked += 1
+            while pending:
+                if not remaining:
+                    # Every token already scored; later files cannot change the result.
+                    break
+                if _timed_out(start, inference.max_seconds):
+                    break
+                if files_checked >= inference.max_files_per_repo:
+                    break
+                path, future = pending.popleft()
+                fill()
+
+                rel_path = str(path.relative_to(repo_path)).lower()
+                unmatched = [pair for pair in remaining if pair[0] not in rel_path]
+                score += len(remaining) - len(unmatched)
+                remaining = unmatched
+
+                try:
+                    content = future.result()
+                except OSError:
+                    continue
+                if content is None:
+                    continue
+
+                unmatched = [pair for pair in remaining if pair[1] not in content]
+                score += 2.0 * (len(remaining) - len(unmatched))
+                remaining = unmatched
+                files_checked += 1
+        finally:
+            for _, future in pending:
+                future.cancel()
     return score
 
 
 def _iter_repo_files(repo_path: Path, inference: RepoInferenceConfig) -> Iterable[Path]:
+    # Built once per walk instead of once per file.
+    ignore_exts = frozenset(ext.lower() for ext in inference.ignore_extensions)
+    ignore_dirs = frozenset(inference.ignore_dirs)
     tracked = _git_ls_files(repo_path)
     if tracked:
         for rel in tracked:
             path = repo_path / rel
-            if _skip_path(path, inference):
+            if _skip_path(path, ignore_exts, ignore_dirs):
                 continue
             yield path
         return
 
-    for root, dirs, files in os.walk(repo_path):
-        dirs[:] = [d for d in dirs if d not in inference.ignore_dirs]
-        for filename in files:
-            path = Path(root) / filename
-            if _skip_path(path, inference):
-                continue
-            yield path
+    if not ignore_dirs.isdisjoint(repo_path.parts):
+        return
+    for entry in _scandir_files(str(repo_path), ignore_dirs):
+        if os.path.splitext(entry.name)[1].lower() not in ignore_exts:
+            yield Path(entry.path)
+
+
+def _scandir_files(top: str, ignore_dirs: FrozenSet[str]) -> Iterator[os.DirEntry]:
+    """Files under *top*, in ``os.walk`` top-down order, skipping *ignore_dirs*.
+
+    File and directory checks come from the readdir d_type, so no entry is
+    stat'ed unless it is a symlink. Symlinked files are followed, symlinked
+    directories are not, matching the ``os.walk`` walk this replaces.
+    """
+    stack = [top]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in ignore_dirs:
+                                subdirs.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
 
 
 def _git_ls_files(repo_path: Path) -> List[str]:
+    try:
+        index_mtime = (repo_path / ".git" / "index").stat().st_mtime_ns
+    except OSError:
+        # No index (or a worktree whose .git is a file): nothing to key on.
+        return _run_git_ls_files(repo_path) or []
+    try:
+        return list(_git_ls_files_cached(str(repo_path), index_mtime))
+    except _LsFilesFailed:
+        return []
+
+
+class _LsFilesFailed(Exception):
+    pass
+
+
+@lru_cache(maxsize=256)
+def _git_ls_files_cached(repo_path: str, index_mtime_ns: int) -> Tuple[str, ...]:
+    """ls-files for *repo_path*; any change to the index changes the key.
+
+    Failures raise so they are not cached and the next call retries.
+    """
+    files = _run_git_ls_files(Path(repo_path))
+    if files is None:
+        raise _LsFilesFailed(repo_path)
+    return tuple(files)
+
+
+def _run_git_ls_files(repo_path: Path) -> Optional[List[str]]:
     try:
         result = subprocess.run(
-            ["git", "-C", str(repo_path), "ls-files"],
+            ["git", "-C", str(repo_path), "ls-files", "-z"],
             check=False,
             capture_output=True,
-            text=True,
             timeout=10,
         )
     except (OSError, subprocess.TimeoutExpired):
-        return []
+        return None
     if result.returncode != 0:
-        return []
-    return [line for line in result.stdout.splitlines() if line]
+        return None
+    # -z output is NUL-separated and unquoted, so paths with newlines or
+    # non-ASCII characters come through verbatim. They are raw bytes, and
+    # fsdecode maps names that are not valid UTF-8 to surrogates, which
+    # still open as the right file.
+    return [os.fsdecode(name) for name in result.stdout.split(b"\0") if name]
 
 
-def _skip_path(path: Path, inference: RepoInferenceConfig) -> bool:
-    if not path.is_file():
+def _skip_path(path: Path, ignore_exts: FrozenSet[str], ignore_dirs: FrozenSet[str]) -> bool:
+    # Cheap name checks first; the stat in is_file only runs for survivors.
+    if path.suffix.lower() in ignore_exts:
         return True
-    if path.suffix.lower() in {ext.lower() for ext in inference.ignore_extensions}:
+    if not ignore_dirs.isdisjoint(path.parts):
         return True
-    for part in path.parts:
-        if part in inference.ignore_dirs:
-            return True
-    return False
+    return not path.is_file()
 
 
-def _read_text_file(path: Path, max_bytes: int) -> Optional[str]:
-    with path.open("rb") as handle:
-        raw = handle.read(max_bytes + 1)
+def _read_text_file(path: Path, max_bytes: int) -> Optional[bytes]:
+    """First *max_bytes* of *path*, ASCII-lowercased, or None for binary files."""
+    # One unbuffered read; a BufferedReader would only add a copy here.
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        raw = os.read(fd, max_bytes)
+    finally:
+        os.close(fd)
     if b"\x00" in raw:
         return None
-    if len(raw) > max_bytes:
-        raw = raw[:max_bytes]
-    return raw.decode("utf-8", errors="ignore")
+    # Only one buffer outlives this call: the raw read is dropped on return.
+    return raw.lower()
 
 
 def _timed_out(start: float, max_seconds: int) -> bool:
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Callable, List, Optional, Tuple
 
-from .util import run_command
+from .util import CommandResult, run_command, write_json
+
+REPO_CACHE_DIR = Path("~/.j2pr/repo_cache").expanduser()
 
 
 def git_status(cwd: Path) -> str:
@@ -57,11 +64,63 @@ def diff_numstat(cwd: Path) -> List[Tuple[int, int, str]]:
     return entries
 
 
+def diff_numstat_named(cwd: Path) -> List[Tuple[int, int, str]]:
+    """Changed files with added/removed line counts from one ``git diff`` call.
+
+    ``-z`` keeps unusual file names intact and ``--no-renames`` reports a
+    rename as a delete plus an add, so every entry carries one plain path.
+    Binary files count as zero lines.
+    """
+    result = run_command(["git", "diff", "--numstat", "--no-renames", "-z"], cwd=cwd)
+    entries = []
+    for record in result.stdout.split("\0"):
+        parts = record.split("\t", 2)
+        if len(parts) == 3 and parts[2]:
+            added = int(parts[0]) if parts[0].isdigit() else 0
+            removed = int(parts[1]) if parts[1].isdigit() else 0
+            entries.append((added, removed, parts[2]))
+    return entries
+
+
 def diff_patch(cwd: Path) -> str:
     result = run_command(["git", "diff"], cwd=cwd)
     return result.stdout
 
 
+def write_diff_patch(cwd: Path, path: Path) -> int:
+    """Stream ``git diff`` straight into *path* as raw bytes; returns the exit code.
+
+    The patch is never decoded or held in memory, however large it is.
+    """
+    with open(path, "wb") as fh:
+        return subprocess.run(["git", "diff"], cwd=cwd, stdout=fh, stderr=subprocess.DEVNULL).returncode
+
+
+@dataclass
+class DiffInfo:
+    numstat: List[Tuple[int, int, str]]
+    status: str
+    # None when the patch was streamed to a file instead.
+    patch: Optional[str]
+
+
+def gather_diff_info(cwd: Path, patch_path: Optional[Path] = None) -> DiffInfo:
+    """Collect numstat, porcelain status and the patch with overlapping git calls.
+
+    The three calls are independent and read-only, so wall time is the
+    slowest one rather than the sum. With *patch_path* the patch is written
+    there by ``write_diff_patch`` rather than returned.
+    """
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        numstat = pool.submit(diff_numstat_named, cwd)
+        status = pool.submit(git_status, cwd)
+        if patch_path is None:
+            patch = pool.submit(diff_patch, cwd)
+        else:
+            patch = pool.submit(write_diff_patch, cwd, patch_path)
+    return DiffInfo(numstat.result(), status.result(), patch.result() if patch_path is None else None)
+
+
 def detect_test_command(cwd: Path) -> str | None:
     """Auto-detect the test command for a repo by inspecting build files.
 
@@ -81,6 +140,93 @@ def detect_test_command(cwd: Path) -> str | None:
     return None
 
 
+def _root_stamp(cwd: Path) -> Optional[int]:
+    """mtime of the repo's top-level directory; changes when a build file is added or removed."""
+    try:
+        return cwd.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _origin_head_stamp(cwd: Path) -> Optional[list]:
+    """mtimes of the refs ``git symbolic-ref refs/remotes/origin/HEAD`` reads.
+
+    ``git remote set-head`` rewrites the loose ``refs/remotes/origin/HEAD``;
+    ``packed-refs`` covers refs that were packed. Returns None (do not cache)
+    when ``.git`` is not a directory, e.g. in a linked worktree.
+    """
+    git_dir = cwd / ".git"
+    if not git_dir.is_dir():
+        return None
+    stamp = []
+    for ref in (git_dir / "refs" / "remotes" / "origin" / "HEAD", git_dir / "packed-refs"):
+        try:
+            stamp.append(ref.stat().st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return stamp
+
+
+def _cached_probe(
+    cwd: Path,
+    name: str,
+    probe: Callable[[Path], Optional[str]],
+    stamp_of: Callable[[Path], Any] = _root_stamp,
+) -> Optional[str]:
+    """Return ``probe(cwd)``, reusing the last result while ``stamp_of(cwd)`` is unchanged.
+
+    Results live in ``REPO_CACHE_DIR/<hash of repo path>.json``, each with the
+    stamp it was computed under. ``None`` is never cached, so a transient
+    probe failure is retried next time; a ``None`` stamp disables caching.
+    """
+    stamp = stamp_of(cwd)
+    if stamp is None:
+        return probe(cwd)
+    digest = hashlib.sha1(str(cwd.resolve()).encode("utf-8")).hexdigest()[:16]
+    cache_path = REPO_CACHE_DIR / f"{digest}.json"
+    entries: dict = {}
+    try:
+        data = json.loads(cache_path.read_text())
+        entries = data.get("entries", {})
+        entry = entries.get(name)
+        if entry is not None and entry.get("stamp") == stamp:
+            return entry["value"]
+    except (OSError, ValueError, AttributeError, KeyError):
+        entries = {}
+    value = probe(cwd)
+    if value is not None:
+        entries[name] = {"stamp": stamp, "value": value}
+        try:
+            REPO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            write_json(cache_path, {"repo": str(cwd), "entries": entries})
+        except OSError:
+            pass
+    return value
+
+
+def detect_default_branch_cached(cwd: Path) -> str | None:
+    return _cached_probe(cwd, "default_branch", detect_default_branch, _origin_head_stamp)
+
+
+def detect_test_command_cached(cwd: Path) -> str | None:
+    return _cached_probe(cwd, "test_command", detect_test_command)
+
+
 def remote_branch_exists(cwd: Path, branch: str) -> bool:
     result = run_command(["git", "ls-remote", "--heads", "origin", branch], cwd=cwd)
     return bool(result.stdout.strip())
+
+
+def start_push(cwd: Path, branch: str) -> subprocess.Popen:
+    """Start ``git push -u origin <branch>`` without waiting for it."""
+    return subprocess.Popen(
+        ["git", "push", "-u", "origin", branch],
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+
+
+def finish_push(proc: subprocess.Popen) -> CommandResult:
+    stdout, _ = proc.communicate()
+    return CommandResult(list(proc.args), proc.returncode, stdout or b"")
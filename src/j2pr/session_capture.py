@@ -8,35 +8,119 @@ Captured artefacts per session:
   session_output.log   – raw tee of all stdout / stderr
   session_events.jsonl – structured timestamped events
   session_manifest.json – machine-readable summary written on close
+
+The output root also keeps ``.index/sessions_index.json``, a ticket-keyed
+copy of every manifest that ``list_sessions`` reads instead of walking
+each session directory.
 """
 
 from __future__ import annotations
 
+import heapq
 import io
 import json
 import os
 import platform
-import re
+import shutil
 import sys
+import threading
 import time
+from collections import Counter, deque
 from contextlib import contextmanager
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; index updates are then unlocked
+    fcntl = None
 
 from .config import SessionCaptureConfig
+from .util import expand_path, json_bytes, json_loads, write_json
 
 
 # ---------------------------------------------------------------------------
 # Tee writers – mirror writes to both the original stream and a capture file
 # ---------------------------------------------------------------------------
 
+# Capture files are flushed once this much is pending or this long has passed
+# since the last flush, instead of after every write. Closing the session and
+# session_error always flush.
+_FLUSH_BYTES = 64 * 1024
+_FLUSH_INTERVAL_S = 0.5
+_FILE_BUFFER = 1 << 20
+
+
+class _ThrottledFlush:
+    """Flush *fh* on a size or time threshold rather than per write."""
+
+    def __init__(self, fh: Any) -> None:
+        self._fh = fh
+        self._pending = 0
+        self._last = time.monotonic()
+
+    def wrote(self, nbytes: int) -> None:
+        self._pending += nbytes
+        now = time.monotonic()
+        if self._pending >= _FLUSH_BYTES or now - self._last >= _FLUSH_INTERVAL_S:
+            self.flush(now)
+
+    def flush(self, now: Optional[float] = None) -> None:
+        self._fh.flush()
+        self._pending = 0
+        self._last = time.monotonic() if now is None else now
+
+
+class _CaptureSink:
+    """Collect tee'd text and write it to the binary capture file in batches.
+
+    Each ``write`` is a list append; the pending chunks are joined and encoded
+    once per flush (on the same size/time thresholds as ``_ThrottledFlush``)
+    instead of going through a text layer per write.
+    """
+
+    def __init__(self, fh: BinaryIO) -> None:
+        self._fh = fh
+        self._chunks: List[str] = []
+        self._pending = 0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, s: str) -> None:
+        with self._lock:
+            self._chunks.append(s)
+            self._pending += len(s)
+            now = time.monotonic()
+            if self._pending >= _FLUSH_BYTES or now - self._last >= _FLUSH_INTERVAL_S:
+                self._drain(now)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._drain(time.monotonic())
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._fh.close()
+
+    def _drain(self, now: float) -> None:
+        data = "".join(self._chunks).encode("utf-8", "replace")
+        self._chunks.clear()
+        self._pending = 0
+        self._last = now
+        self._fh.write(data)
+        self._fh.flush()
+
+
 class _TeeWriter(io.TextIOBase):
-    """Duplicates writes to an original stream and a log file handle."""
+    """Duplicates writes to an original stream and a capture sink."""
 
-    def __init__(self, original: io.TextIOBase, capture_fh: io.TextIOBase) -> None:
+    def __init__(self, original: io.TextIOBase, capture: _CaptureSink) -> None:
         self._original = original
-        self._capture_fh = capture_fh
+        self._capture = capture
 
     # --- delegated properties so Rich / Typer still think this is a tty ---
 
@@ -56,16 +140,112 @@ class _TeeWriter(io.TextIOBase):
     def write(self, s: str) -> int:
         self._original.write(s)
         try:
-            self._capture_fh.write(s)
-            self._capture_fh.flush()
+            self._capture.write(s)
         except Exception:
             pass  # never let capture failures interrupt the real run
         return len(s)
 
     def flush(self) -> None:
+        # Callers (Rich, print) flush the terminal after nearly every write;
+        # the capture file keeps to its own thresholds.
         self._original.flush()
+
+
+# Events waiting for the writer thread are capped; past this the oldest
+# non-lifecycle events are dropped so a runaway producer cannot grow memory.
+_QUEUE_MAX = 10_000
+_WRITE_BATCH = 256
+_CRITICAL_EVENTS = frozenset({"session_started", "session_error", "session_finished"})
+
+
+class _EventWriter:
+    """Serialize and write event entries on a daemon thread.
+
+    ``put`` only appends to a queue; the thread coalesces pending entries into
+    one ``write()``. ``sync`` blocks until everything queued so far is on disk.
+    """
+
+    def __init__(self, fh: BinaryIO, flush: _ThrottledFlush) -> None:
+        self._fh = fh
+        self._flush = flush
+        self._pending: deque[Any] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="j2pr-session-events", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def put(self, entry: Dict[str, Any]) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._pending) >= _QUEUE_MAX:
+                self._drop_oldest()
+            self._pending.append(entry)
+            self._cond.notify()
+
+    def sync(self) -> None:
+        done = threading.Event()
+        with self._cond:
+            if self._closed:
+                return
+            self._pending.append(done)
+            self._cond.notify()
+        done.wait()
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending.append(None)
+            self._cond.notify()
+        self._thread.join()
+
+    def _drop_oldest(self) -> None:
+        for i, item in enumerate(self._pending):
+            if isinstance(item, dict) and item.get("event") not in _CRITICAL_EVENTS:
+                del self._pending[i]
+                return
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                batch = [self._pending.popleft() for _ in range(min(len(self._pending), _WRITE_BATCH))]
+            lines: List[bytes] = []
+            for item in batch:
+                if isinstance(item, dict):
+                    try:
+                        lines.append(json_bytes(item) + b"\n")
+                    except Exception:
+                        pass
+                    continue
+                self._write(lines)
+                lines = []
+                if item is None:
+                    self._safe(self._flush.flush)
+                    return
+                self._safe(self._flush.flush)
+                item.set()
+            self._write(lines)
+
+    def _write(self, lines: List[bytes]) -> None:
+        if not lines:
+            return
+        data = b"".join(lines)
         try:
-            self._capture_fh.flush()
+            self._fh.write(data)
+            self._flush.wrote(len(data))
+        except Exception:
+            pass
+
+    @staticmethod
+    def _safe(fn: Callable[[], None]) -> None:
+        try:
+            fn()
         except Exception:
             pass
 
@@ -74,28 +254,63 @@ class _TeeWriter(io.TextIOBase):
 # Redaction helpers
 # ---------------------------------------------------------------------------
 
-def _build_redaction_re(patterns: List[str]) -> re.Pattern[str]:
-    """Build a single regex that matches any dict key containing a pattern."""
-    escaped = [re.escape(p) for p in patterns]
-    return re.compile("|".join(escaped), re.IGNORECASE) if escaped else re.compile(r"(?!)")
+def _build_key_matcher(patterns: List[str]) -> Callable[[str], bool]:
+    """Return a predicate telling whether a dict key must be redacted.
+
+    A key matches when it contains any pattern, case-insensitively. The
+    patterns are lowered once and tested as plain substrings of the lowered
+    key, which is cheaper than an IGNORECASE alternation regex. Event
+    payloads reuse a small vocabulary of keys, so each distinct key is
+    matched once and the verdict is memoized.
+    """
+    needles = tuple(p.lower() for p in patterns)
+
+    @lru_cache(maxsize=1024)
+    def is_secret(key: str) -> bool:
+        lowered = key.lower()
+        for needle in needles:
+            if needle in lowered:
+                return True
+        return False
 
+    return is_secret
 
-def _redact_dict(data: Dict[str, Any], redaction_re: re.Pattern[str]) -> Dict[str, Any]:
-    """Recursively redact values whose keys match the redaction regex."""
-    out: Dict[str, Any] = {}
+
+def _redact_dict(data: Dict[str, Any], is_secret: Callable[[str], bool]) -> Dict[str, Any]:
+    """Recursively redact values whose keys match *is_secret*.
+
+    Copy-on-write: a dict or list with nothing to redact is returned as is,
+    so clean payloads (the common case) are walked but never copied.
+    """
+    out: Optional[Dict[str, Any]] = None
     for key, value in data.items():
-        if redaction_re.search(key):
-            out[key] = "***REDACTED***"
+        if is_secret(key):
+            new = "***REDACTED***"
         elif isinstance(value, dict):
-            out[key] = _redact_dict(value, redaction_re)
+            new = _redact_dict(value, is_secret)
         elif isinstance(value, list):
-            out[key] = [
-                _redact_dict(v, redaction_re) if isinstance(v, dict) else v
-                for v in value
-            ]
+            new = _redact_list(value, is_secret)
         else:
-            out[key] = value
-    return out
+            continue
+        if new is value:
+            continue
+        if out is None:
+            out = dict(data)
+        out[key] = new
+    return data if out is None else out
+
+
+def _redact_list(items: List[Any], is_secret: Callable[[str], bool]) -> List[Any]:
+    out: Optional[List[Any]] = None
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        new = _redact_dict(item, is_secret)
+        if new is not item:
+            if out is None:
+                out = list(items)
+            out[i] = new
+    return items if out is None else out
 
 
 # ---------------------------------------------------------------------------
@@ -125,11 +340,13 @@ class SessionCapture:
         self._run_id = run_id
         self._enabled = cfg.enabled
         self._events: List[Dict[str, Any]] = []
-        self._redaction_re = _build_redaction_re(cfg.redact_patterns)
+        self._is_secret = _build_key_matcher(cfg.redact_patterns)
+        self._needs_redaction = bool(cfg.redact_patterns)
         self._start_ts: Optional[float] = None
         self._session_dir: Optional[Path] = None
-        self._output_fh: Optional[io.TextIOBase] = None
-        self._events_fh: Optional[io.TextIOBase] = None
+        self._output_sink: Optional[_CaptureSink] = None
+        self._events_fh: Optional[BinaryIO] = None
+        self._events_writer: Optional[_EventWriter] = None
         self._orig_stdout: Optional[io.TextIOBase] = None
         self._orig_stderr: Optional[io.TextIOBase] = None
 
@@ -144,9 +361,17 @@ class SessionCapture:
         return self._session_dir
 
     def event(self, name: str, data: Optional[Dict[str, Any]] = None) -> None:
-        """Record a structured event with a monotonic + wall-clock timestamp."""
+        """Record a structured event with a monotonic + wall-clock timestamp.
+
+        The entry is serialized and written by a background thread, so *data*
+        must not be mutated after the call.
+        """
         if not self._enabled:
             return
+        self._record(name, self._redact(data) if isinstance(data, dict) else data)
+
+    def _record(self, name: str, data: Any) -> None:
+        """Append and queue an event whose *data* is already redacted."""
         entry = {
             "ts": datetime.now(timezone.utc).isoformat(),
             "elapsed_s": round(time.monotonic() - self._start_ts, 3) if self._start_ts else 0,
@@ -155,12 +380,16 @@ class SessionCapture:
             "run_id": self._run_id,
         }
         if data:
-            entry["data"] = _redact_dict(data, self._redaction_re) if isinstance(data, dict) else data
+            entry["data"] = data
         self._events.append(entry)
-        if self._events_fh:
+        if self._events_writer:
             try:
-                self._events_fh.write(json.dumps(entry, default=str) + "\n")
-                self._events_fh.flush()
+                self._events_writer.put(entry)
+                if name == "session_error":
+                    # Make the failure durable even if the process dies right after.
+                    self._events_writer.sync()
+                    if self._output_sink:
+                        self._output_sink.flush()
             except Exception:
                 pass
 
@@ -170,18 +399,21 @@ class SessionCapture:
         if not self._enabled:
             return self
         self._start_ts = time.monotonic()
-        output_root = Path(self._cfg.output_dir).expanduser()
+        output_root = expand_path(self._cfg.output_dir)
         self._session_dir = output_root / self._ticket / self._run_id
         self._session_dir.mkdir(parents=True, exist_ok=True)
 
-        self._output_fh = open(self._session_dir / "session_output.log", "w")  # noqa: SIM115
-        self._events_fh = open(self._session_dir / "session_events.jsonl", "w")  # noqa: SIM115
+        self._output_sink = _CaptureSink(open(self._session_dir / "session_output.log", "wb"))  # noqa: SIM115
+        # The events buffer is larger than the flush threshold, so _ThrottledFlush decides when data hits disk.
+        self._events_fh = open(self._session_dir / "session_events.jsonl", "wb", buffering=_FILE_BUFFER)  # noqa: SIM115
+        self._events_writer = _EventWriter(self._events_fh, _ThrottledFlush(self._events_fh))
+        self._events_writer.start()
 
         # tee stdout / stderr
         self._orig_stdout = sys.stdout
         self._orig_stderr = sys.stderr
-        sys.stdout = _TeeWriter(self._orig_stdout, self._output_fh)  # type: ignore[assignment]
-        sys.stderr = _TeeWriter(self._orig_stderr, self._output_fh)  # type: ignore[assignment]
+        sys.stdout = _TeeWriter(self._orig_stdout, self._output_sink)  # type: ignore[assignment]
+        sys.stderr = _TeeWriter(self._orig_stderr, self._output_sink)  # type: ignore[assignment]
 
         # opening event
         self.event("session_started", self._env_snapshot())
@@ -203,7 +435,15 @@ class SessionCapture:
             "exit_reason": "error" if exc_type else "normal",
         })
 
+        if self._events_writer:
+            self._events_writer.close()
+            self._events_writer = None
+
         self._write_manifest()
+        try:
+            _update_index(expand_path(self._cfg.output_dir), self._ticket)
+        except Exception:
+            pass
 
         # restore streams
         if self._orig_stdout:
@@ -212,7 +452,7 @@ class SessionCapture:
             sys.stderr = self._orig_stderr
 
         # close file handles
-        for fh in (self._output_fh, self._events_fh):
+        for fh in (self._output_sink, self._events_fh):
             if fh:
                 try:
                     fh.close()
@@ -222,12 +462,16 @@ class SessionCapture:
         # retention cleanup
         if self._cfg.retention_days > 0:
             _prune_old_sessions(
-                Path(self._cfg.output_dir).expanduser(),
+                expand_path(self._cfg.output_dir),
                 self._cfg.retention_days,
             )
 
     # -- internal --
 
+    def _redact(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Redact *data*; with no redact_patterns configured it is returned without a walk."""
+        return _redact_dict(data, self._is_secret) if self._needs_redaction else data
+
     def _env_snapshot(self) -> Dict[str, Any]:
         """Capture environment metadata at session start."""
         snapshot: Dict[str, Any] = {
@@ -237,16 +481,13 @@ class SessionCapture:
             "pid": os.getpid(),
         }
         if self._cfg.include_env:
-            safe_env = {
-                k: v
-                for k, v in os.environ.items()
-                if not self._redaction_re.search(k)
-            }
-            # Only include j2pr-relevant env vars to keep size reasonable
+            # Only include j2pr-relevant env vars to keep size reasonable; the
+            # prefix test runs first so redaction only sees the survivors.
             relevant_prefixes = ("J2PR_", "GITHUB_", "JIRA_", "CURSOR_", "PATH", "HOME", "USER", "SHELL")
             snapshot["env"] = {
-                k: v for k, v in safe_env.items()
-                if any(k.startswith(p) for p in relevant_prefixes)
+                k: v
+                for k, v in os.environ.items()
+                if k.startswith(relevant_prefixes) and not (self._needs_redaction and self._is_secret(k))
             }
         return snapshot
 
@@ -254,14 +495,14 @@ class SessionCapture:
         """Record a redacted snapshot of the loaded config."""
         if not self._enabled or not self._cfg.include_config:
             return
-        self.event("config_snapshot", _redact_dict(raw_config, self._redaction_re))
+        self._record("config_snapshot", self._redact(raw_config))
 
     def _write_manifest(self) -> None:
         """Write a machine-readable session summary for AI agents to parse."""
         if not self._session_dir:
             return
         elapsed = round(time.monotonic() - self._start_ts, 3) if self._start_ts else 0
-        event_names = [e["event"] for e in self._events]
+        event_name_counts = Counter(e["event"] for e in self._events)
 
         # Collect all errors from events
         errors = [
@@ -271,14 +512,14 @@ class SessionCapture:
         ]
 
         manifest = {
-            "version": 1,
+            "version": 2,
             "ticket": self._ticket,
             "run_id": self._run_id,
             "started_at": self._events[0]["ts"] if self._events else None,
             "finished_at": datetime.now(timezone.utc).isoformat(),
             "elapsed_s": elapsed,
             "event_count": len(self._events),
-            "event_names": event_names,
+            "event_name_counts": event_name_counts,
             "errors": errors,
             "files": [
                 "session_output.log",
@@ -291,9 +532,11 @@ class SessionCapture:
                 "from j2pr runs."
             ),
         }
+        if self._cfg.verbose_manifest:
+            manifest["event_names"] = [e["event"] for e in self._events]
         try:
-            (self._session_dir / "session_manifest.json").write_text(
-                json.dumps(manifest, indent=2, default=str) + "\n"
+            (self._session_dir / "session_manifest.json").write_bytes(
+                json_bytes(manifest, indent=True) + b"\n"
             )
         except Exception:
             pass
@@ -305,54 +548,181 @@ class SessionCapture:
 
 def _prune_old_sessions(root: Path, retention_days: int) -> None:
     """Remove session directories older than *retention_days*."""
-    if not root.exists():
-        return
     cutoff = time.time() - (retention_days * 86400)
-    for ticket_dir in root.iterdir():
-        if not ticket_dir.is_dir():
-            continue
-        for session_dir in ticket_dir.iterdir():
-            if not session_dir.is_dir():
-                continue
-            manifest = session_dir / "session_manifest.json"
-            if manifest.exists() and manifest.stat().st_mtime < cutoff:
-                try:
-                    import shutil
-                    shutil.rmtree(session_dir)
-                except Exception:
-                    pass
-        # Remove empty ticket dirs
-        if ticket_dir.exists() and not any(ticket_dir.iterdir()):
+    try:
+        ticket_dirs = _ticket_dirs(root)
+    except OSError:
+        return
+    for ticket_dir in ticket_dirs:
+        for session_dir in _subdirs(ticket_dir.path):
             try:
-                ticket_dir.rmdir()
-            except Exception:
-                pass
+                mtime = os.stat(os.path.join(session_dir.path, "session_manifest.json")).st_mtime
+            except OSError:
+                continue
+            if mtime < cutoff:
+                shutil.rmtree(session_dir.path, ignore_errors=True)
+        # Remove empty ticket dirs; rmdir refuses a non-empty one.
+        try:
+            os.rmdir(ticket_dir.path)
+        except OSError:
+            pass
 
 
 # ---------------------------------------------------------------------------
 # Listing / reading helpers (used by CLI commands)
 # ---------------------------------------------------------------------------
 
-def list_sessions(output_dir: str) -> List[Dict[str, Any]]:
-    """Return a list of session manifests, newest first."""
-    root = Path(output_dir).expanduser()
-    sessions: List[Dict[str, Any]] = []
+# The index lives in a dot-directory so rewriting it never bumps the mtime of
+# the sessions root, which is what staleness checks compare against.
+_INDEX_PATH = Path(".index") / "sessions_index.json"
+_INDEX_LOCK_PATH = Path(".index") / "sessions_index.lock"
+
+
+def _subdirs(path: Union[str, Path]) -> List[os.DirEntry[str]]:
+    """Subdirectories of *path* via scandir, whose entries cache their type."""
+    with os.scandir(path) as it:
+        return [entry for entry in it if entry.is_dir()]
+
+
+def _ticket_dirs(root: Path) -> List[os.DirEntry[str]]:
+    return [entry for entry in _subdirs(root) if not entry.name.startswith(".")]
+
+
+def _read_ticket_manifests(ticket_dir: Union[str, Path]) -> List[Dict[str, Any]]:
+    manifests: List[Dict[str, Any]] = []
+    with os.scandir(ticket_dir) as it:
+        session_paths = sorted((entry.path for entry in it), reverse=True)
+    for session_path in session_paths:
+        try:
+            with open(os.path.join(session_path, "session_manifest.json"), "rb") as fh:
+                manifest = json_loads(fh.read())
+            manifest["session_path"] = session_path
+            manifests.append(manifest)
+        except Exception:
+            pass
+    manifests.sort(key=lambda s: s.get("finished_at", ""), reverse=True)
+    return manifests
+
+
+def _write_index(root: Path, index: Dict[str, List[Dict[str, Any]]]) -> None:
+    try:
+        path = root / _INDEX_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(path, {"version": 1, "tickets": index})
+    except Exception:
+        pass
+
+
+@contextmanager
+def _index_lock(root: Path) -> Iterator[None]:
+    """Serialize index rewrites across processes with an flock on a lock file.
+
+    Without it two sessions closing at once each write back the index they
+    loaded, and the last writer drops the other's entry. If the lock cannot
+    be taken the update proceeds unlocked rather than failing.
+    """
+    fd: Optional[int] = None
+    if fcntl is not None:
+        try:
+            lock_path = root / _INDEX_LOCK_PATH
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except OSError:
+            if fd is not None:
+                os.close(fd)
+            fd = None
+    try:
+        yield
+    finally:
+        if fd is not None:
+            os.close(fd)  # closing the fd releases the lock
+
+
+def _read_fresh_index(root: Path, ticket_dirs: List[os.DirEntry[str]]) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """The on-disk index, or None if it is missing or a directory changed since it was written."""
+    index_path = root / _INDEX_PATH
+    try:
+        index_mtime = index_path.stat().st_mtime_ns
+        # Strict comparison: filesystem timestamps are coarse, so a change in
+        # the same tick as the index write must still count as stale.
+        if all(p.stat().st_mtime_ns < index_mtime for p in [root, *ticket_dirs]):
+            return json_loads(index_path.read_bytes())["tickets"]
+    except Exception:
+        pass
+    return None
+
+
+def _rebuild_index(ticket_dirs: List[os.DirEntry[str]]) -> Dict[str, List[Dict[str, Any]]]:
+    return {d.name: _read_ticket_manifests(d.path) for d in sorted(ticket_dirs, key=lambda d: d.name)}
+
+
+def _load_index(root: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """Return ticket -> manifests, rebuilding the on-disk index if a directory changed since it was written."""
+    index = _read_fresh_index(root, _ticket_dirs(root))
+    if index is not None:
+        return index
+    with _index_lock(root):
+        # Another process may have rebuilt it while we waited for the lock.
+        ticket_dirs = _ticket_dirs(root)
+        index = _read_fresh_index(root, ticket_dirs)
+        if index is None:
+            index = _rebuild_index(ticket_dirs)
+            _write_index(root, index)
+    return index
+
+
+def _update_index(root: Path, ticket: str) -> None:
+    """Refresh the index entry for *ticket* after one of its sessions closes.
+
+    The index is re-read under the lock, so concurrent updates for other
+    tickets are merged instead of overwritten.
+    """
+    with _index_lock(root):
+        ticket_dirs = _ticket_dirs(root)
+        index = _read_fresh_index(root, ticket_dirs)
+        if index is None:
+            index = _rebuild_index(ticket_dirs)
+        ticket_dir = root / ticket
+        index[ticket] = _read_ticket_manifests(ticket_dir) if ticket_dir.is_dir() else []
+        _write_index(root, index)
+
+
+def iter_sessions(
+    output_dir: str,
+    *,
+    ticket: Optional[str] = None,
+    run_id_prefix: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield session manifests matching the filters, in no particular order."""
+    root = expand_path(output_dir)
     if not root.exists():
-        return sessions
-    for ticket_dir in sorted(root.iterdir()):
-        if not ticket_dir.is_dir():
-            continue
-        for session_dir in sorted(ticket_dir.iterdir(), reverse=True):
-            manifest_path = session_dir / "session_manifest.json"
-            if manifest_path.exists():
-                try:
-                    manifest = json.loads(manifest_path.read_text())
-                    manifest["session_path"] = str(session_dir)
-                    sessions.append(manifest)
-                except Exception:
-                    pass
-    sessions.sort(key=lambda s: s.get("finished_at", ""), reverse=True)
-    return sessions
+        return
+    index = _load_index(root)
+    groups = [index.get(ticket, [])] if ticket is not None else index.values()
+    for manifests in groups:
+        for manifest in manifests:
+            if not run_id_prefix or manifest.get("run_id", "").startswith(run_id_prefix):
+                yield manifest
+
+
+def _finished_at(session: Dict[str, Any]) -> str:
+    return session.get("finished_at") or ""
+
+
+def list_sessions(
+    output_dir: str,
+    *,
+    ticket: Optional[str] = None,
+    run_id_prefix: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Return session manifests, newest first, optionally filtered by ticket and run id prefix."""
+    matches = iter_sessions(output_dir, ticket=ticket, run_id_prefix=run_id_prefix)
+    if limit is not None:
+        # Bounded heap: O(n log limit) and only *limit* manifests kept around.
+        return heapq.nlargest(limit, matches, key=_finished_at)
+    return sorted(matches, key=_finished_at, reverse=True)
 
 
 def read_session_events(session_dir: Path) -> List[Dict[str, Any]]:
@@ -361,11 +731,11 @@ def read_session_events(session_dir: Path) -> List[Dict[str, Any]]:
     if not events_path.exists():
         return []
     events = []
-    for line in events_path.read_text().splitlines():
-        line = line.strip()
-        if line:
+    # Parse the raw bytes line by line; no full-file decode to str first.
+    for line in events_path.read_bytes().split(b"\n"):
+        if line.strip():
             try:
-                events.append(json.loads(line))
+                events.append(json_loads(line))
             except json.JSONDecodeError:
                 pass
     return events
@@ -376,7 +746,7 @@ def read_session_output(session_dir: Path) -> str:
     output_path = session_dir / "session_output.log"
     if not output_path.exists():
         return ""
-    return output_path.read_text()
+    return output_path.read_text(encoding="utf-8", errors="replace")
 
 
 @contextmanager
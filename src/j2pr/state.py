@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import atexit
 import sqlite3
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Sequence
+
+from .util import intern_str
 
 
 DB_PATH = Path("~/.j2pr/state.sqlite").expanduser()
 
+# Locks older than this are assumed to belong to a crashed run.
+LOCK_TTL_SECONDS = 6 * 60 * 60
+
 
 @dataclass
 class TicketState:
@@ -34,13 +42,92 @@ class RunState:
 
 def _connect() -> sqlite3.Connection:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    # check_same_thread=False only so _close_all can close every thread's
+    # connection at exit; each connection is otherwise used by its own thread.
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
     return conn
 
 
-def init_db() -> None:
+_LOCAL = threading.local()
+_OPEN: list[sqlite3.Connection] = []
+_OPEN_LOCK = threading.Lock()
+
+
+def _connection() -> sqlite3.Connection:
+    """This thread's connection to DB_PATH, opened on first use and then reused."""
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is not None and _LOCAL.path == DB_PATH:
+        return conn
+    if conn is not None:
+        _close(conn)
     conn = _connect()
+    _LOCAL.conn, _LOCAL.path = conn, DB_PATH
+    with _OPEN_LOCK:
+        _OPEN.append(conn)
+    return conn
+
+
+def _close(conn: sqlite3.Connection) -> None:
+    with _OPEN_LOCK:
+        if conn in _OPEN:
+            _OPEN.remove(conn)
+    conn.close()
+
+
+def _close_all() -> None:
+    """Close every cached connection (registered with atexit)."""
+    with _OPEN_LOCK:
+        conns, _OPEN[:] = list(_OPEN), []
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    _LOCAL.__dict__.clear()
+
+
+atexit.register(_close_all)
+
+
+_TX = threading.local()
+
+
+@contextmanager
+def transaction() -> Iterator[None]:
+    """Group the state writes made inside the block into one commit.
+
+    Writes in the block become visible together (or not at all if the block
+    raises). Nested blocks join the outer one.
+    """
+    if getattr(_TX, "active", False):
+        yield
+        return
+    conn = _connection()
+    _TX.active = True
+    try:
+        with conn:
+            yield
+    finally:
+        _TX.active = False
+
+
+@contextmanager
+def _cursor() -> Iterator[sqlite3.Cursor]:
+    """Cursor for a write: joins the open transaction, else commits on its own."""
+    conn = _connection()
+    if getattr(_TX, "active", False):
+        yield conn.cursor()
+        return
+    with conn:
+        yield conn.cursor()
+
+
+def init_db() -> None:
+    conn = _connection()
     cur = conn.cursor()
     cur.execute(
         """
@@ -83,21 +170,17 @@ def init_db() -> None:
         """
     )
     conn.commit()
-    conn.close()
 
 
 def get_ticket(ticket_key: str) -> Optional[TicketState]:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM tickets WHERE ticket_key = ?", (ticket_key,))
+    cur = _connection().execute("SELECT * FROM tickets WHERE ticket_key = ?", (ticket_key,))
     row = cur.fetchone()
-    conn.close()
     if not row:
         return None
     return TicketState(
         ticket_key=row["ticket_key"],
-        status=row["status"],
-        repo=row["repo"],
+        status=intern_str(row["status"]),
+        repo=intern_str(row["repo"]),
         branch=row["branch"],
         pr_url=row["pr_url"],
         last_run_id=row["last_run_id"],
@@ -105,126 +188,160 @@ def get_ticket(ticket_key: str) -> Optional[TicketState]:
     )
 
 
-def upsert_ticket(state: TicketState) -> None:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO tickets (ticket_key, status, repo, branch, pr_url, last_run_id, updated_at, last_error)
-        VALUES (?, ?, ?, ?, ?, ?, datetime('now'), ?)
-        ON CONFLICT(ticket_key) DO UPDATE SET
-            status=excluded.status,
-            repo=excluded.repo,
-            branch=excluded.branch,
-            pr_url=excluded.pr_url,
-            last_run_id=excluded.last_run_id,
-            updated_at=datetime('now'),
-            last_error=excluded.last_error
-        """,
-        (
-            state.ticket_key,
-            state.status,
-            state.repo,
-            state.branch,
-            state.pr_url,
-            state.last_run_id,
-            state.last_error,
-        ),
+_UPSERT_TICKET_SQL = """
+    INSERT INTO tickets (ticket_key, status, repo, branch, pr_url, last_run_id, updated_at, last_error)
+    VALUES (?, ?, ?, ?, ?, ?, datetime('now'), ?)
+    ON CONFLICT(ticket_key) DO UPDATE SET
+        status=excluded.status,
+        repo=excluded.repo,
+        branch=excluded.branch,
+        pr_url=excluded.pr_url,
+        last_run_id=excluded.last_run_id,
+        updated_at=datetime('now'),
+        last_error=excluded.last_error
+"""
+
+_INSERT_RUN_SQL = """
+    INSERT INTO runs (run_id, ticket_key, started_at, status, repo, branch, pr_url, artifacts_dir, cursor_exit_code)
+    VALUES (?, ?, datetime('now'), ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _ticket_params(state: TicketState) -> tuple:
+    return (
+        state.ticket_key,
+        state.status,
+        state.repo,
+        state.branch,
+        state.pr_url,
+        state.last_run_id,
+        state.last_error,
     )
-    conn.commit()
-    conn.close()
 
 
-def add_run(run: RunState) -> None:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO runs (run_id, ticket_key, started_at, status, repo, branch, pr_url, artifacts_dir, cursor_exit_code)
-        VALUES (?, ?, datetime('now'), ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            run.run_id,
-            run.ticket_key,
-            run.status,
-            run.repo,
-            run.branch,
-            run.pr_url,
-            run.artifacts_dir,
-            run.cursor_exit_code,
-        ),
+def _run_params(run: RunState) -> tuple:
+    return (
+        run.run_id,
+        run.ticket_key,
+        run.status,
+        run.repo,
+        run.branch,
+        run.pr_url,
+        run.artifacts_dir,
+        run.cursor_exit_code,
     )
-    conn.commit()
-    conn.close()
+
+
+def upsert_ticket(state: TicketState) -> None:
+    with _cursor() as cur:
+        cur.execute(_UPSERT_TICKET_SQL, _ticket_params(state))
+
+
+def upsert_tickets(states: Sequence[TicketState]) -> None:
+    """Upsert many tickets with one prepared statement in one commit."""
+    with _cursor() as cur:
+        cur.executemany(_UPSERT_TICKET_SQL, [_ticket_params(state) for state in states])
+
+
+def add_run(run: RunState) -> None:
+    with _cursor() as cur:
+        cur.execute(_INSERT_RUN_SQL, _run_params(run))
+
+
+def add_runs(runs: Sequence[RunState]) -> None:
+    """Insert many runs with one prepared statement in one commit."""
+    with _cursor() as cur:
+        cur.executemany(_INSERT_RUN_SQL, [_run_params(run) for run in runs])
 
 
 def finish_run(run_id: str, status: str, pr_url: Optional[str], cursor_exit_code: Optional[int]) -> None:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE runs
-        SET finished_at=datetime('now'), status=?, pr_url=?, cursor_exit_code=?
-        WHERE run_id=?
-        """,
-        (status, pr_url, cursor_exit_code, run_id),
-    )
-    conn.commit()
-    conn.close()
+    with _cursor() as cur:
+        cur.execute(
+            """
+            UPDATE runs
+            SET finished_at=datetime('now'), status=?, pr_url=?, cursor_exit_code=?
+            WHERE run_id=?
+            """,
+            (status, pr_url, cursor_exit_code, run_id),
+        )
 
 
 def set_lock(repo: str, run_id: str) -> None:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO locks (repo, locked_at, run_id)
-        VALUES (?, datetime('now'), ?)
-        ON CONFLICT(repo) DO UPDATE SET locked_at=datetime('now'), run_id=excluded.run_id
-        """,
-        (repo, run_id),
-    )
-    conn.commit()
-    conn.close()
+    with _cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO locks (repo, locked_at, run_id)
+            VALUES (?, datetime('now'), ?)
+            ON CONFLICT(repo) DO UPDATE SET locked_at=datetime('now'), run_id=excluded.run_id
+            """,
+            (repo, run_id),
+        )
 
 
-def clear_lock(repo: str) -> None:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM locks WHERE repo = ?", (repo,))
-    conn.commit()
-    conn.close()
+def try_acquire_lock(repo: str, run_id: str, ttl_seconds: int = LOCK_TTL_SECONDS) -> bool:
+    """Atomically take the lock for *repo*; True iff *run_id* now holds it.
+
+    A lock older than *ttl_seconds* is treated as abandoned by a crashed run
+    and taken over. The check and the write are one statement, so two runs
+    can never both acquire the same repo.
+    """
+    with _cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO locks (repo, locked_at, run_id)
+            VALUES (?, datetime('now'), ?)
+            ON CONFLICT(repo) DO UPDATE SET locked_at=datetime('now'), run_id=excluded.run_id
+            WHERE locks.run_id = excluded.run_id OR locks.locked_at < datetime('now', ?)
+            """,
+            (repo, run_id, f"-{int(ttl_seconds)} seconds"),
+        )
+        acquired = cur.rowcount == 1
+    return acquired
+
+
+def clear_lock(repo: str, run_id: Optional[str] = None) -> None:
+    """Release the lock for *repo*; with *run_id*, only if that run still holds it."""
+    with _cursor() as cur:
+        if run_id is None:
+            cur.execute("DELETE FROM locks WHERE repo = ?", (repo,))
+        else:
+            cur.execute("DELETE FROM locks WHERE repo = ? AND run_id = ?", (repo, run_id))
 
 
 def get_lock(repo: str) -> Optional[str]:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT run_id FROM locks WHERE repo = ?", (repo,))
+    cur = _connection().execute("SELECT run_id FROM locks WHERE repo = ?", (repo,))
     row = cur.fetchone()
-    conn.close()
     return row["run_id"] if row else None
 
 
 def clear_all_locks() -> int:
     """Delete every row in the locks table. Returns count of rows removed."""
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("SELECT COUNT(*) FROM locks")
-    count = cur.fetchone()[0]
-    cur.execute("DELETE FROM locks")
-    conn.commit()
-    conn.close()
+    with _cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM locks")
+        count = cur.fetchone()[0]
+        cur.execute("DELETE FROM locks")
     return count
 
 
 def dump_table(table_name: str) -> list[dict]:
     """Return all rows from *table_name* as a list of dicts."""
+    return list(dump_table_iter(table_name))
+
+
+def dump_table_iter(table_name: str, columns: Optional[Sequence[str]] = None) -> Iterator[dict]:
+    """Yield rows from *table_name* one at a time, optionally selecting only *columns*."""
     allowed = {"tickets", "runs", "locks"}
     if table_name not in allowed:
         raise ValueError(f"Unknown table: {table_name}")
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(f"SELECT * FROM {table_name}")  # noqa: S608 – table name is allow-listed
-    rows = [dict(r) for r in cur.fetchall()]
-    conn.close()
-    return rows
+    cur = _connection().cursor()
+    if columns:
+        known = {row["name"] for row in cur.execute(f"PRAGMA table_info({table_name})")}
+        unknown = [col for col in columns if col not in known]
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {table_name}: {', '.join(unknown)}")
+        selected = ", ".join(columns)
+    else:
+        selected = "*"
+    cur.execute(f"SELECT {selected} FROM {table_name}")  # noqa: S608 – names are allow-listed
+    for row in cur:
+        yield dict(row)
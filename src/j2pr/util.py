@@ -1,34 +1,130 @@
 from __future__ import annotations
 
 import json
+import os
 import subprocess
+import sys
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup, installed with the "fast" extra
+    orjson = None
 
 
 @dataclass
 class CommandResult:
+    """Exit status and raw output of a command; text is decoded on first access."""
+
     command: List[str]
     returncode: int
-    stdout: str
-    stderr: str
+    stdout_bytes: bytes = b""
+    stderr_bytes: bytes = b""
+
+    @cached_property
+    def stdout(self) -> str:
+        return self.stdout_bytes.decode("utf-8", "replace")
+
+    @cached_property
+    def stderr(self) -> str:
+        return self.stderr_bytes.decode("utf-8", "replace")
 
 
 def run_command(
     command: List[str],
     cwd: Optional[Path] = None,
     timeout: Optional[int] = None,
+    merge_stderr: bool = False,
 ) -> CommandResult:
+    """Run *command* and capture its output.
+
+    With ``merge_stderr`` the child's stderr is redirected into stdout at the
+    fd level, so ``stdout`` holds interleaved output and ``stderr`` is empty.
+    """
     proc = subprocess.run(
         command,
-        cwd=str(cwd) if cwd else None,
-        capture_output=True,
-        text=True,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT if merge_stderr else subprocess.PIPE,
         timeout=timeout,
     )
-    return CommandResult(command, proc.returncode, proc.stdout, proc.stderr)
+    return CommandResult(command, proc.returncode, proc.stdout, proc.stderr or b"")
+
+
+@lru_cache(maxsize=32)
+def expand_path(path: str) -> Path:
+    """``Path(path).expanduser()``, memoized; configured roots repeat per call."""
+    return Path(path).expanduser()
+
+
+def run_command_to_file(
+    command: List[str],
+    log_path: Path,
+    cwd: Optional[Path] = None,
+    timeout: Optional[int] = None,
+) -> int:
+    """Run *command* with stdout and stderr streamed into *log_path*.
+
+    The output never passes through Python, so large logs (e.g. a verbose
+    test run) cost no memory. Returns the exit code.
+    """
+    with open(log_path, "wb") as fh:
+        return subprocess.run(command, cwd=cwd, stdout=fh, stderr=subprocess.STDOUT, timeout=timeout).returncode
+
+
+def intern_str(value: Any) -> Any:
+    """Intern *value* if it is a string; anything else is returned unchanged."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def json_bytes(data: Any, indent: bool = False) -> bytes:
+    """Serialize *data* as UTF-8 JSON, compact unless *indent* is set.
+
+    Uses orjson when installed. Datetimes and dataclasses are passed through
+    to ``default=str`` so both backends produce the same output. Strings that
+    are not valid UTF-8 (lone surrogates from ``surrogateescape``-decoded env
+    vars, paths or command output) fall back to ASCII-escaped stdlib output.
+    """
+    try:
+        if orjson is not None:
+            option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(data, default=str, option=option)
+        return _stdlib_json_bytes(data, indent, ensure_ascii=False)
+    except (TypeError, UnicodeEncodeError):
+        return _stdlib_json_bytes(data, indent, ensure_ascii=True)
+
+
+def _stdlib_json_bytes(data: Any, indent: bool, ensure_ascii: bool) -> bytes:
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=ensure_ascii, default=str).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=ensure_ascii, default=str).encode("utf-8")
+
+
+def json_text(data: Any, indent: bool = False) -> str:
+    return json_bytes(data, indent).decode("utf-8")
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON from *data*; errors are always ``json.JSONDecodeError``.
+
+    orjson rejects escaped lone surrogates, which ``json_bytes`` can emit, so
+    an orjson failure is retried with the stdlib parser.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
 
 
 def write_json(path: Path, data: dict) -> None:
-    path.write_text(json.dumps(data, indent=2, default=str))
+    """Write *data* as JSON atomically: a crash never leaves a partial file."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(json_bytes(data))
+    os.replace(tmp, path)
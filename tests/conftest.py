@@ -0,0 +1,9 @@
+import pytest
+
+import j2pr.repo as repo
+
+
+@pytest.fixture(autouse=True)
+def _isolated_repo_cache(tmp_path_factory, monkeypatch) -> None:
+    # Probe caches must never be written to the real ~/.j2pr during tests.
+    monkeypatch.setattr(repo, "REPO_CACHE_DIR", tmp_path_factory.mktemp("repo_cache"))
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import subprocess
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from j2pr.agent import (
+    DEFAULT_PROMPT,
+    AgentSpec,
+    PromptVars,
+    SubagentRegistry,
+    _render_prompt,
+    gather_agents,
+    lifecycle_path,
+    run_agent,
+)
+
+FOOTER = (
+    'J2PR_RESULT: {"decision":"proceed","summary":"ok","changes":[],"tests":{},'
+    '"risk":"low","repo":"repo","branch":"branch","commit_message":"msg",'
+    '"notes_for_reviewer":"","blocking_reason":""}'
+)
+
+
+def _fake_agent(tmp_path: Path) -> str:
+    script = tmp_path / "fake-agent"
+    script.write_text(f"#!/bin/sh\necho working\necho '{FOOTER}'\n")
+    script.chmod(0o755)
+    return str(script)
+
+
+def _prompt_vars() -> PromptVars:
+    return PromptVars(*([""] * 12))
+
+
+def test_run_agent_parses_footer(tmp_path: Path) -> None:
+    transcript = tmp_path / "agent_transcript.log"
+    result = run_agent(_fake_agent(tmp_path), tmp_path, _prompt_vars(), 1, transcript)
+    assert result.exit_code == 0
+    assert result.footer is not None
+    assert result.footer.decision == "proceed"
+    assert "working" in transcript.read_text()
+    events = [json.loads(line)["event"] for line in lifecycle_path(transcript).read_text().splitlines()]
+    assert events == ["spawned", "started", "completed"]
+
+
+def test_gather_agents_runs_all_specs(tmp_path: Path) -> None:
+    command = _fake_agent(tmp_path)
+    specs = [
+        AgentSpec(command, tmp_path, _prompt_vars(), 1, tmp_path / f"transcript-{i}.log")
+        for i in range(3)
+    ]
+    results = asyncio.run(gather_agents(specs, max_concurrency=2))
+    assert len(results) == 3
+    assert all(r.footer is not None for r in results)
+
+
+def test_subagent_registry_gathers_results(tmp_path: Path) -> None:
+    command = _fake_agent(tmp_path)
+    with SubagentRegistry(max_workers=2) as registry:
+        handles = [
+            registry.spawn_async(AgentSpec(command, tmp_path, _prompt_vars(), 1, tmp_path / f"t-{i}.log"))
+            for i in range(2)
+        ]
+        results = registry.gather_results([h.session_id for h in handles])
+    assert set(results) == {h.session_id for h in handles}
+    assert all(r.footer is not None for r in results.values())
+
+
+def test_render_prompt_matches_str_format(tmp_path: Path) -> None:
+    prompt_vars = _prompt_vars()
+    prompt_vars.ticket_key = "ABC-1"
+    assert _render_prompt(prompt_vars, None) == DEFAULT_PROMPT.format(**asdict(prompt_vars))
+
+    template = tmp_path / "prompt.txt"
+    template.write_text("Ticket {ticket_key!r} {{literal}}")
+    assert _render_prompt(prompt_vars, str(template)) == "Ticket 'ABC-1' {literal}"
+
+
+def test_run_agent_kills_on_timeout(tmp_path: Path, monkeypatch) -> None:
+    import j2pr.agent as agent
+
+    script = tmp_path / "slow-agent"
+    script.write_text("#!/bin/sh\necho started\ntrap '' TERM\nsleep 30\n")
+    script.chmod(0o755)
+    monkeypatch.setattr(agent, "_KILL_GRACE_SECONDS", 0.2)
+
+    async def _run() -> None:
+        await asyncio.wait_for(
+            agent.run_agent_async(str(script), tmp_path, _prompt_vars(), 0, tmp_path / "t.log"),
+            timeout=10,
+        )
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(_run())
+
+
+def test_cancelled_run_kills_agent_process_group(tmp_path: Path, monkeypatch) -> None:
+    import os
+    import time
+
+    import j2pr.agent as agent
+
+    script = tmp_path / "busy-agent"
+    script.write_text("#!/bin/sh\nsleep 30 &\necho started\nsleep 30\n")
+    script.chmod(0o755)
+    monkeypatch.setattr(agent, "_KILL_GRACE_SECONDS", 0.2)
+    pids = []
+
+    async def _run() -> None:
+        task = asyncio.ensure_future(
+            agent.run_agent_async(str(script), tmp_path, _prompt_vars(), 5, tmp_path / "t.log", on_spawn=pids.append)
+        )
+        await asyncio.sleep(0.5)
+        task.cancel()
+        await task
+
+    def _live_group_members(pgid: int) -> list:
+        # Zombies left for init to reap are dead; only running members count.
+        members = []
+        for entry in os.listdir("/proc"):
+            try:
+                stat = Path("/proc", entry, "stat").read_text()
+            except (OSError, ValueError):
+                continue
+            fields = stat.rsplit(")", 1)[-1].split()
+            if int(fields[2]) == pgid and fields[0] != "Z":
+                members.append(entry)
+        return members
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(_run())
+    deadline = time.monotonic() + 2
+    while _live_group_members(pids[0]) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert _live_group_members(pids[0]) == []
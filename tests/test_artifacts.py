@@ -0,0 +1,52 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from j2pr.artifacts import FLUSH_POLICIES, ArtifactBatch, write_artifacts
+
+
+def test_write_artifacts_accepts_text_and_bytes(tmp_path: Path) -> None:
+    base = tmp_path / "run"
+    write_artifacts(base, {"status.txt": "clean\n", "diff.patch": b"\xff raw"})
+    assert (base / "status.txt").read_text() == "clean\n"
+    assert (base / "diff.patch").read_bytes() == b"\xff raw"
+
+    write_artifacts(base, {"status.txt": "x"})
+    assert (base / "status.txt").read_text() == "x"
+
+
+def test_artifact_batch_coalesces_and_flushes_on_exit(tmp_path: Path) -> None:
+    base = tmp_path / "run"
+    with ArtifactBatch(base) as batch:
+        batch.add_json("pr.json", {"pr_url": "old"})
+        batch.add_json("pr.json", {"pr_url": "new"})
+        batch.add_text("notes.txt", "hello")
+        assert not (base / "pr.json").exists()
+    assert json.loads((base / "pr.json").read_text()) == {"pr_url": "new"}
+    assert (base / "notes.txt").read_text() == "hello"
+
+
+def test_artifact_batch_flush_policies(tmp_path: Path) -> None:
+    for policy in FLUSH_POLICIES:
+        base = tmp_path / policy
+        with ArtifactBatch(base, flush_policy=policy) as batch:
+            batch.add_text("a.txt", "a")
+            batch.add_text("b.txt", b"b")
+        assert (base / "a.txt").read_text() == "a"
+        assert (base / "b.txt").read_text() == "b"
+
+    with pytest.raises(ValueError):
+        ArtifactBatch(tmp_path, flush_policy="always")
+
+
+def test_json_bytes_backends_agree(monkeypatch) -> None:
+    from datetime import datetime
+
+    from j2pr import util
+
+    payload = {"when": datetime(2024, 1, 2, 3, 4, 5), "items": [], "name": "café", "nested": {"a": [1, 2]}}
+    fast = (util.json_bytes(payload), util.json_bytes(payload, indent=True))
+    monkeypatch.setattr(util, "orjson", None)
+    assert (util.json_bytes(payload), util.json_bytes(payload, indent=True)) == fast
+    assert util.json_loads(fast[0])["when"] == "2024-01-02 03:04:05"
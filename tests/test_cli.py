@@ -0,0 +1,124 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from j2pr import cli
+from j2pr.footer import AgentFooter
+
+CONFIG = """
+jira:
+  base_url: "https://example.atlassian.net"
+  email: "test@example.com"
+  api_token: "token"
+  jql: "project = TEST"
+  fields: ["summary", "description"]
+github:
+  owner: "org"
+  default_base_branch: "main"
+workspace:
+  root_dir: "/tmp"
+  repo_allowlist: ["repo"]
+guardrails: {}
+cursor:
+  command: "cursor-agent"
+"""
+
+
+def test_load_config_is_cached_until_file_changes(tmp_path: Path, monkeypatch) -> None:
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(CONFIG)
+    monkeypatch.setenv("J2PR_CONFIG", str(config_path))
+    monkeypatch.setattr(cli, "_CONFIG_CACHE", {})
+
+    first = cli._load_config_or_exit()
+    assert cli._load_config_or_exit() is first
+
+    config_path.write_text(CONFIG.replace("org", "other"))
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = cli._load_config_or_exit()
+    assert second is not first
+    assert second.github.owner == "other"
+
+
+def test_denylist_matches_any_substring() -> None:
+    matcher = cli._denylist_matcher(["rm -rf", "curl"])
+    assert cli._denylist_ok(["git fetch --all", "pytest -q"], matcher)
+    assert not cli._denylist_ok(["sh -c 'curl example.com'"], matcher)
+    assert cli._denylist_ok(["anything"], cli._denylist_matcher([]))
+
+
+def test_record_commands_refuses_denied_command_before_logging_it() -> None:
+    matcher = cli._denylist_matcher(["curl"])
+    commands = ["git fetch --all"]
+    cli._record_commands(commands, ["pytest -q"], matcher)
+    with pytest.raises(RuntimeError, match="denylist"):
+        cli._record_commands(commands, ["curl example.com"], matcher)
+    assert commands == ["git fetch --all", "pytest -q"]
+
+
+def test_slug_keeps_one_dash_per_separator() -> None:
+    assert cli._slug("  Fix: login -- page (v2)!") == "fix--login----page--v2"
+    assert cli._slug("Café ΟΔΟΣ") == "café-οδοσ"
+
+
+def test_adf_description_is_flattened_to_text() -> None:
+    adf = {
+        "type": "doc",
+        "content": [
+            {"type": "paragraph", "content": [{"type": "text", "text": "Fix the login page."}]},
+            {"type": "heading", "content": [{"type": "text", "text": "Acceptance Criteria"}]},
+            {"type": "paragraph", "content": [{"type": "text", "text": "Users can log in."}]},
+        ],
+    }
+    description = cli._extract_description({"description": adf})
+    assert description == "Fix the login page.\nAcceptance Criteria\nUsers can log in."
+    assert cli._acceptance_from_description(description) == "Users can log in."
+
+
+def test_pr_body_sections() -> None:
+    footer = AgentFooter(
+        decision="proceed",
+        summary="Fix login",
+        changes=["a.py", "b.py"],
+        tests={},
+        risk="",
+        repo="repo",
+        branch="branch",
+        commit_message="msg",
+        notes_for_reviewer="",
+        blocking_reason="",
+    )
+    body = cli._pr_body(footer, "pytest -q")
+    assert body.startswith("## Summary\nFix login\n\n## Changes\n- a.py\n- b.py\n\n")
+    assert "## How to Test\n- pytest -q\n\n## Risk / Rollout Notes\nn/a\n\n" in body
+    assert body.endswith("## Notes for Reviewer\nn/a")
+
+
+def test_classify_error() -> None:
+    assert cli._classify_error("Deny glob violation: secrets.env") == "NEEDS_HUMAN"
+    assert cli._classify_error("Tests failed") == "NEEDS_HUMAN"
+    assert cli._classify_error("gh pr create failed") == "FAILED"
+
+
+def test_existing_pr_is_returned_without_pushing(tmp_path: Path, monkeypatch) -> None:
+    import yaml
+
+    from j2pr import github, repo
+    from j2pr.config import AppConfig
+
+    config = AppConfig.model_validate(yaml.safe_load(CONFIG))
+    pushes = []
+    monkeypatch.setattr(repo, "start_push", lambda cwd, branch: pushes.append(branch) or "push")
+    monkeypatch.setattr(repo, "remote_branch_exists", lambda cwd, branch: True)
+    monkeypatch.setattr(github, "find_pr_with_gh", lambda branch, cwd=None: None)
+    monkeypatch.setattr(github, "find_pr_by_jira_with_gh", lambda key, cwd=None: "https://github.com/org/repo/pull/7")
+
+    found = cli._existing_pr_or_push(config, "repo", tmp_path, "j2pr/ABC-1", "ABC-1")
+    assert found == ("https://github.com/org/repo/pull/7", "jira_key", None)
+    assert pushes == []
+
+    monkeypatch.setattr(github, "find_pr_by_jira_with_gh", lambda key, cwd=None: None)
+    assert cli._existing_pr_or_push(config, "repo", tmp_path, "j2pr/ABC-1", "ABC-1") == (None, None, "push")
+    assert pushes == ["j2pr/ABC-1"]
@@ -1,7 +1,9 @@
 import os
 from pathlib import Path
 
-from j2pr.config import load_config
+import pytest
+
+from j2pr.config import AppConfig, check_config_shape, config_cache_path, load_config, load_config_fast
 
 
 def test_env_interpolation(tmp_path: Path, monkeypatch) -> None:
@@ -47,3 +49,112 @@ cursor:
     result = load_config(str(config_path))
     assert result.config is not None
     assert result.config.jira.api_token == "abc123"
+
+
+def test_config_cache_skips_validation_and_keeps_env_live(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("JIRA_TOKEN", "first")
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        """
+jira:
+  base_url: "https://example.atlassian.net"
+  email: "test@example.com"
+  api_token: "${JIRA_TOKEN}"
+  jql: "project = TEST"
+  fields: ["summary"]
+github:
+  owner: "org"
+  default_base_branch: "main"
+workspace:
+  root_dir: "/tmp"
+  repo_allowlist: ["repo"]
+  repo_inference:
+    enabled: true
+guardrails: {}
+cursor:
+  command: "cursor-agent"
+"""
+    )
+    assert load_config(str(config_path)).config is not None
+    cache_path = config_cache_path(config_path)
+    assert "first" not in cache_path.read_text()
+
+    monkeypatch.setenv("JIRA_TOKEN", "second")
+    monkeypatch.setattr(AppConfig, "model_validate", classmethod(lambda cls, data: pytest.fail("validated")))
+    cached = load_config(str(config_path)).config
+    assert cached.jira.api_token == "second"
+    assert cached.workspace.repo_inference.enabled is True
+    assert cached.session_capture.enabled is False
+
+
+def test_config_cache_respects_schema_version_and_validate_flag(tmp_path: Path, monkeypatch) -> None:
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        """
+jira: {base_url: "https://x", email: "e", api_token: "t", jql: "q", fields: ["summary"]}
+github: {owner: "org", default_base_branch: "main"}
+workspace: {root_dir: "/tmp", repo_allowlist: ["repo"]}
+guardrails: {}
+cursor: {command: "cursor-agent"}
+"""
+    )
+    assert load_config(str(config_path)).config is not None
+    assert load_config_fast(str(config_path)) is not None
+
+    monkeypatch.setenv("J2PR_VALIDATE_CONFIG", "1")
+    assert load_config_fast(str(config_path)) is None
+    monkeypatch.delenv("J2PR_VALIDATE_CONFIG")
+
+    monkeypatch.setattr("j2pr.config.CONFIG_SCHEMA_VERSION", 2)
+    assert load_config_fast(str(config_path)) is None
+
+
+def test_cached_interpolation_escapes_env_values(tmp_path: Path, monkeypatch) -> None:
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        """
+jira: {base_url: "https://x", email: "e", api_token: "${JIRA_TOKEN}", jql: "q", fields: ["summary"]}
+github: {owner: "org", default_base_branch: "main"}
+workspace: {root_dir: "/tmp", repo_allowlist: ["repo"]}
+guardrails: {}
+cursor: {command: "cursor-agent"}
+"""
+    )
+    monkeypatch.setenv("JIRA_TOKEN", "plain")
+    assert load_config(str(config_path)).config is not None
+    monkeypatch.setenv("JIRA_TOKEN", 'a"b\\c\nd: #e')
+    cached = load_config_fast(str(config_path))
+    assert cached is not None
+    assert cached.jira.api_token == 'a"b\\c\nd: #e'
+
+
+def test_cache_hit_matches_miss_for_placeholders_in_mapping_keys(tmp_path: Path, monkeypatch) -> None:
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        """
+jira: {base_url: "https://x", email: "e", api_token: "t", jql: "q", fields: ["summary"]}
+github: {owner: "org", default_base_branch: "main"}
+workspace: {root_dir: "/tmp", repo_allowlist: ["repo"], repo_mapping: {"${TEAM}-api": "${TEAM}-repo"}}
+guardrails: {}
+cursor: {command: "cursor-agent"}
+"""
+    )
+    monkeypatch.setenv("TEAM", "core")
+    miss = load_config(str(config_path)).config
+    hit = load_config_fast(str(config_path))
+    assert hit is not None
+    assert miss.workspace.repo_mapping == {"${TEAM}-api": "core-repo"}
+    assert hit.model_dump() == miss.model_dump()
+
+
+def test_check_config_shape_reports_missing_sections_without_validating(tmp_path: Path, monkeypatch) -> None:
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("jira: {base_url: 1}\ngithub: {}\n")
+    monkeypatch.setattr(AppConfig, "model_validate", classmethod(lambda cls, data: pytest.fail("validated")))
+    assert check_config_shape(str(config_path)) == [
+        "Missing section: workspace",
+        "Missing section: guardrails",
+        "Missing section: cursor",
+    ]
+    config_path.write_text("jira: [unclosed\n")
+    assert check_config_shape(str(config_path))[0].startswith("Invalid YAML")
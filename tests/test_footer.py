@@ -1,4 +1,4 @@
-from j2pr.footer import parse_footer
+from j2pr.footer import find_footer, parse_footer
 
 
 def test_parse_footer() -> None:
@@ -11,3 +11,17 @@ def test_parse_footer() -> None:
     footer = parse_footer(line)
     assert footer is not None
     assert footer.decision == "proceed"
+
+
+def test_find_footer_picks_last_line_start() -> None:
+    transcript = (
+        b"noise\n"
+        b'J2PR_RESULT: {"decision":"first"}\n'
+        b"more output\n"
+        b'  J2PR_RESULT: {"decision":"last"}\n'
+        b'echo J2PR_RESULT: {"decision":"inline"}\n'
+    )
+    footer = find_footer(transcript)
+    assert footer is not None
+    assert footer.decision == "last"
+    assert find_footer(b"no footer here\n") is None
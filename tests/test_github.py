@@ -0,0 +1,32 @@
+import time
+
+import pytest
+
+from j2pr.github import first_pr_hit
+
+
+def test_first_pr_hit_prefers_branch_even_when_jira_key_returns_first() -> None:
+    def slow_branch() -> str:
+        time.sleep(0.2)
+        return "https://github.com/org/repo/pull/1"
+
+    assert first_pr_hit({"branch": slow_branch, "jira_key": lambda: "https://github.com/org/repo/pull/2"}) == (
+        "https://github.com/org/repo/pull/1",
+        "branch",
+    )
+    assert first_pr_hit({"branch": lambda: None, "jira_key": lambda: "https://github.com/org/repo/pull/2"}) == (
+        "https://github.com/org/repo/pull/2",
+        "jira_key",
+    )
+    assert first_pr_hit({"branch": lambda: None, "jira_key": lambda: None}) == (None, None)
+
+
+def test_first_pr_hit_raises_the_error_of_the_lookup_with_priority() -> None:
+    def boom() -> str:
+        raise RuntimeError("rate limited")
+
+    with pytest.raises(RuntimeError):
+        first_pr_hit({"branch": boom, "jira_key": lambda: "url"})
+    assert first_pr_hit({"branch": lambda: "url", "jira_key": boom}) == ("url", "branch")
+    with pytest.raises(RuntimeError):
+        first_pr_hit({"branch": lambda: None, "jira_key": boom})
@@ -6,3 +6,11 @@ def test_matches_deny_glob() -> None:
     assert matches_deny_glob(".github/workflows/ci.yml", deny)
     assert matches_deny_glob("migrations/001.sql", deny)
     assert not matches_deny_glob("src/app.py", deny)
+
+
+def test_deny_glob_wildcards_stay_within_components() -> None:
+    assert matches_deny_glob("config/prod.env", ["*.env"])
+    assert matches_deny_glob("app/secrets/key.pem", ["secrets/*"])
+    assert not matches_deny_glob("secrets/nested/key.pem", ["secrets/*"])
+    assert matches_deny_glob("migrations/2024/001.sql", ["migrations/**"])
+    assert not matches_deny_glob("src/app.py", [])
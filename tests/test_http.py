@@ -0,0 +1,55 @@
+import requests
+
+from j2pr import http
+from j2pr.http import POOL_MAXSIZE, close_sessions, get_github_session, get_jira_session
+
+
+def test_sessions_are_shared_per_service() -> None:
+    jira = get_jira_session()
+    assert get_jira_session() is jira
+    assert get_github_session() is not jira
+    assert jira.get_adapter("https://example.atlassian.net")._pool_maxsize == POOL_MAXSIZE
+
+    close_sessions("jira")
+    assert get_jira_session() is not jira
+    close_sessions()
+
+
+class _ScriptedAdapter(requests.adapters.BaseAdapter):
+    def __init__(self, statuses, headers=None) -> None:
+        super().__init__()
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        self.calls += 1
+        resp = requests.Response()
+        resp.status_code = self.statuses.pop(0)
+        resp.headers.update(self.headers)
+        resp.request = request
+        resp.url = request.url
+        return resp
+
+    def close(self) -> None:
+        pass
+
+
+def test_rate_limited_session_retries_429_with_retry_after(monkeypatch) -> None:
+    sleeps = []
+    monkeypatch.setattr(http.time, "sleep", sleeps.append)
+    session = http.RateLimitedSession()
+    adapter = _ScriptedAdapter([429, 200], {"Retry-After": "2"})
+    session.mount("https://", adapter)
+
+    resp = session.post("https://example.atlassian.net/rest/api/3/search/jql", json={})
+    assert resp.status_code == 200
+    assert adapter.calls == 2
+    assert sleeps and 1.5 < sleeps[0] <= 2
+
+
+def test_rate_limit_headers_pace_the_bucket() -> None:
+    session = http.RateLimitedSession()
+    session.mount("https://", _ScriptedAdapter([200], {"x-ratelimit-fillrate": "10", "x-ratelimit-interval-seconds": "2"}))
+    session.get("https://example.atlassian.net/")
+    assert session.bucket.rate == 5
@@ -0,0 +1,77 @@
+import threading
+
+from j2pr.jira import add_comments, search_issues
+
+
+class _Resp:
+    def __init__(self, status_code, data=None) -> None:
+        self.status_code = status_code
+        self._data = data or {}
+        self.text = ""
+        self.url = ""
+
+    def json(self):
+        return self._data
+
+
+class _LegacyJira:
+    """Fake Server/DC: no /search/jql, 250 issues, pages capped at 100."""
+
+    def __init__(self) -> None:
+        self.starts = []
+        self.lock = threading.Lock()
+
+    def post(self, url, json, **kwargs):
+        if url.endswith("/search/jql"):
+            return _Resp(404)
+        start, size = json["startAt"], min(json["maxResults"], 100)
+        with self.lock:
+            self.starts.append(start)
+        issues = [{"key": f"T-{i}", "fields": {}} for i in range(start, min(start + size, 250))]
+        return _Resp(200, {"issues": issues, "total": 250, "maxResults": size, "startAt": start})
+
+
+class _CloudJira:
+    def __init__(self) -> None:
+        self.tokens = []
+
+    def post(self, url, json, **kwargs):
+        token = json.get("nextPageToken")
+        self.tokens.append(token)
+        start = int(token or 0)
+        issues = [{"key": f"T-{i}", "fields": {}} for i in range(start, start + 2)]
+        return _Resp(200, {"issues": issues, "nextPageToken": str(start + 2), "isLast": start >= 4})
+
+
+def test_legacy_search_fetches_remaining_pages_in_order() -> None:
+    fake = _LegacyJira()
+    issues = search_issues("https://jira", "e", "t", 2, "project = T", ["summary"], limit=230, session=fake)
+    assert [i.key for i in issues] == [f"T-{i}" for i in range(230)]
+    assert sorted(fake.starts) == [0, 100, 200]
+
+
+def test_cloud_search_follows_next_page_token() -> None:
+    fake = _CloudJira()
+    issues = search_issues("https://jira", "e", "t", 3, "project = T", ["summary"], limit=5, session=fake)
+    assert [i.key for i in issues] == ["T-0", "T-1", "T-2", "T-3", "T-4"]
+    assert fake.tokens == [None, "2", "4"]
+
+
+class _CommentJira:
+    def __init__(self) -> None:
+        self.posted = []
+
+    def post(self, url, json, **kwargs):
+        key = url.rsplit("/", 2)[-2]
+        if key == "T-2":
+            return _Resp(403)
+        self.posted.append(key)
+        return _Resp(201)
+
+
+def test_add_comments_reports_failures_in_order() -> None:
+    fake = _CommentJira()
+    results = add_comments("https://jira", "e", "t", 3, [("T-1", "a"), ("T-2", "b"), ("T-3", "c")], session=fake)
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], RuntimeError)
+    assert sorted(fake.posted) == ["T-1", "T-3"]
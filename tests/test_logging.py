@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from j2pr import logging as j2pr_logging
+
+
+def test_log_event_is_redacted_and_flushed_on_shutdown(tmp_path: Path, monkeypatch) -> None:
+    log_path = tmp_path / "j2pr.log"
+    monkeypatch.setattr(j2pr_logging, "LOG_PATH", log_path)
+    j2pr_logging.shutdown_logger()
+    logger = j2pr_logging.setup_logger()
+    try:
+        j2pr_logging.log_event(logger, "run_started", {"ticket": "T-1", "api_TOKEN": "secret"})
+    finally:
+        j2pr_logging.shutdown_logger()
+    line = log_path.read_text()
+    assert 'run_started {"ticket":"T-1","api_TOKEN":"***"}' in line
+    assert "secret" not in line
+
+
+def test_redact_secrets_covers_common_secret_keys() -> None:
+    redacted = j2pr_logging.redact_secrets(
+        {"jira_token": "a", "Password": "b", "client_secret": "c", "API-Key": "d", "apikey": "e", "repo": "r"}
+    )
+    assert redacted == {
+        "jira_token": "***",
+        "Password": "***",
+        "client_secret": "***",
+        "API-Key": "***",
+        "apikey": "***",
+        "repo": "r",
+    }
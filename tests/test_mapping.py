@@ -11,3 +11,11 @@ def test_map_repo_field_value() -> None:
     fields = {"component": "payments"}
     mapping = {"component:payments": "repo-pay"}
     assert map_repo(fields, mapping) == "repo-pay"
+
+
+def test_map_repo_keeps_mapping_order_across_rule_kinds() -> None:
+    mapping = {"labels=backend": "repo-be", "project": "repo-any", "component:payments": "repo-pay"}
+    assert map_repo({"labels": ["ui", "backend"], "project": "P"}, mapping) == "repo-be"
+    assert map_repo({"project": "P", "component": "payments"}, mapping) == "repo-any"
+    assert map_repo({"component": "payments"}, mapping) == "repo-pay"
+    assert map_repo({"labels": ["ui"]}, mapping) is None
@@ -0,0 +1,108 @@
+import os
+import subprocess
+from pathlib import Path
+
+import j2pr.repo as repo
+from j2pr.repo import finish_push, remote_branch_exists, start_push
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def test_background_push_reaches_remote(tmp_path: Path) -> None:
+    remote = tmp_path / "remote.git"
+    work = tmp_path / "work"
+    _git(tmp_path, "init", "--bare", str(remote))
+    _git(tmp_path, "init", str(work))
+    _git(work, "remote", "add", "origin", str(remote))
+    _git(work, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "--allow-empty", "-m", "init")
+    _git(work, "checkout", "-B", "j2pr/ABC-1")
+
+    result = finish_push(start_push(work, "j2pr/ABC-1"))
+    assert result.returncode == 0, result.stdout
+    assert remote_branch_exists(work, "j2pr/ABC-1")
+
+
+def test_detect_test_command_cached_until_repo_root_changes(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(repo, "REPO_CACHE_DIR", tmp_path / "cache")
+    work = tmp_path / "work"
+    work.mkdir()
+    (work / "package.json").write_text("{}")
+    assert repo.detect_test_command_cached(work) == "npm test"
+
+    calls = []
+    monkeypatch.setattr(repo, "detect_test_command", lambda cwd: calls.append(cwd) or "probed")
+    assert repo.detect_test_command_cached(work) == "npm test"
+    assert calls == []
+
+    (work / "pom.xml").write_text("")
+    stat = work.stat()
+    os.utime(work, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert repo.detect_test_command_cached(work) == "probed"
+
+
+def test_detect_default_branch_cached_until_origin_head_changes(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(repo, "REPO_CACHE_DIR", tmp_path / "cache")
+    remote = tmp_path / "remote.git"
+    work = tmp_path / "work"
+    _git(tmp_path, "init", "--bare", str(remote))
+    _git(tmp_path, "init", "-b", "main", str(work))
+    _git(work, "remote", "add", "origin", str(remote))
+    _git(work, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "--allow-empty", "-m", "init")
+    _git(work, "push", "origin", "main", "main:develop")
+    _git(work, "remote", "set-head", "origin", "main")
+    assert repo.detect_default_branch_cached(work) == "main"
+
+    calls = []
+    real = repo.detect_default_branch
+    monkeypatch.setattr(repo, "detect_default_branch", lambda cwd: calls.append(cwd) or real(cwd))
+    assert repo.detect_default_branch_cached(work) == "main"
+    assert calls == []
+
+    _git(work, "remote", "set-head", "origin", "develop")
+    head = work / ".git" / "refs" / "remotes" / "origin" / "HEAD"
+    stat = head.stat()
+    os.utime(head, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert repo.detect_default_branch_cached(work) == "develop"
+    assert len(calls) == 1
+
+
+def test_diff_numstat_named_reports_names_and_counts(tmp_path: Path) -> None:
+    _git(tmp_path, "init")
+    (tmp_path / "a b.txt").write_text("one\n")
+    (tmp_path / "app.py").write_text("x = 1\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-m", "init")
+    (tmp_path / "a b.txt").write_text("one\ntwo\nthree\n")
+    (tmp_path / "app.py").write_text("")
+
+    assert sorted(repo.diff_numstat_named(tmp_path)) == [(0, 1, "app.py"), (2, 0, "a b.txt")]
+
+
+def test_gather_diff_info_collects_all_three_probes(tmp_path: Path) -> None:
+    _git(tmp_path, "init")
+    (tmp_path / "app.py").write_text("x = 1\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-m", "init")
+    (tmp_path / "app.py").write_text("x = 2\n")
+
+    info = repo.gather_diff_info(tmp_path)
+    assert info.numstat == [(1, 1, "app.py")]
+    assert info.status == "M app.py"
+    assert "+x = 2" in info.patch
+
+
+def test_gather_diff_info_streams_patch_to_file(tmp_path: Path) -> None:
+    work = tmp_path / "work"
+    work.mkdir()
+    _git(work, "init")
+    (work / "data.bin").write_bytes(b"caf\xe9\n")
+    _git(work, "add", ".")
+    _git(work, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-m", "init")
+    (work / "data.bin").write_bytes(b"caf\xe9 au lait\n")
+
+    patch_path = tmp_path / "diff.patch"
+    info = repo.gather_diff_info(work, patch_path=patch_path)
+    assert info.patch is None
+    assert b"+caf\xe9 au lait" in patch_path.read_bytes()
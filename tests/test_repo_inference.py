@@ -1,3 +1,5 @@
+import os
+
 from j2pr.config import RepoInferenceConfig
 from j2pr.mapping import infer_repo_from_issue
 
@@ -44,3 +46,85 @@ def test_infer_repo_with_allowlist(tmp_path) -> None:
     fields = {"summary": "Payment gateway timeout", "description": "Retry logic needed"}
     repo = infer_repo_from_issue(fields, str(tmp_path), ["repo-accounts"], inference)
     assert repo is None
+
+
+def test_infer_repo_matches_tokens_in_undecodable_files(tmp_path) -> None:
+    _make_repo(tmp_path, "repo-payments", {})
+    (tmp_path / "repo-payments" / "notes.txt").write_bytes(b"\xff\xfe Payment GATEWAY timeout")
+    inference = RepoInferenceConfig(enabled=True, min_score=2)
+    fields = {"summary": "Payment gateway timeout"}
+    assert infer_repo_from_issue(fields, str(tmp_path), [], inference) == "repo-payments"
+
+
+def test_git_ls_files_is_cached_until_index_changes(tmp_path, monkeypatch) -> None:
+    from j2pr import mapping
+
+    repo = tmp_path / "repo"
+    (repo / ".git").mkdir(parents=True)
+    index = repo / ".git" / "index"
+    index.write_bytes(b"v1")
+    calls = []
+    monkeypatch.setattr(mapping, "_run_git_ls_files", lambda path: calls.append(path) or ["a.py"])
+
+    assert mapping._git_ls_files(repo) == ["a.py"]
+    assert mapping._git_ls_files(repo) == ["a.py"]
+    assert len(calls) == 1
+    os.utime(index, ns=(1, 1))
+    mapping._git_ls_files(repo)
+    assert len(calls) == 2
+
+
+def test_score_repo_content_respects_file_budget_and_walk_order(tmp_path) -> None:
+    from j2pr import mapping
+
+    _make_repo(tmp_path, "repo", {f"f{i:02d}.txt": f"token{i:02d}" for i in range(40)})
+    inference = RepoInferenceConfig(enabled=True, max_files_per_repo=3, max_seconds=0)
+    tokens = [f"token{i:02d}" for i in range(40)]
+    first = mapping._score_repo_content(tmp_path / "repo", tokens, inference, 0.0)
+    assert first == 6.0
+    assert mapping._score_repo_content(tmp_path / "repo", tokens, inference, 0.0) == first
+
+
+def test_git_ls_files_keeps_non_ascii_paths_unquoted(tmp_path) -> None:
+    import subprocess
+
+    from j2pr import mapping
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    (repo / "café.py").write_text("x")
+    subprocess.run(["git", "-C", str(repo), "add", "café.py"], check=True)
+    assert mapping._run_git_ls_files(repo) == ["café.py"]
+
+
+def test_git_ls_files_survives_non_utf8_file_names(tmp_path) -> None:
+    import subprocess
+
+    from j2pr import mapping
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    latin1 = os.fsencode(repo) + b"/caf\xe9.txt"
+    with open(latin1, "wb") as fh:
+        fh.write(b"payments")
+    subprocess.run(["git", "-C", str(repo), "add", "-A"], check=True)
+    files = mapping._run_git_ls_files(repo)
+    assert files == [os.fsdecode(b"caf\xe9.txt")]
+    assert (repo / files[0]).read_bytes() == b"payments"
+
+
+def test_fallback_walk_prunes_ignored_dirs_and_extensions(tmp_path) -> None:
+    from j2pr import mapping
+
+    _make_repo(
+        tmp_path,
+        "repo",
+        {"a.py": "", "logo.png": "", "src/b.py": "", "node_modules/x.js": "", "src/deep/c.py": ""},
+    )
+    inference = RepoInferenceConfig(enabled=True, ignore_dirs=[".git", "node_modules"], ignore_extensions=[".PNG"])
+    repo = tmp_path / "repo"
+    names = [str(p.relative_to(repo)) for p in mapping._iter_repo_files(repo, inference)]
+    assert sorted(names) == ["a.py", "src/b.py", "src/deep/c.py"]
+    assert names.index("src/b.py") < names.index("src/deep/c.py")
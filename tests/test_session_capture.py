@@ -0,0 +1,139 @@
+import os
+from pathlib import Path
+
+from j2pr import session_capture
+from j2pr.config import SessionCaptureConfig
+from j2pr.session_capture import SessionCapture, list_sessions
+
+
+def _capture(output_dir: Path, ticket: str, run_id: str) -> None:
+    cfg = SessionCaptureConfig(enabled=True, output_dir=str(output_dir), include_env=False)
+    with SessionCapture(cfg, ticket=ticket, run_id=run_id) as cap:
+        cap.event("run_initiated", {"ticket": ticket})
+
+
+def test_list_sessions_filters_through_index(tmp_path: Path) -> None:
+    _capture(tmp_path, "ABC-1", "run-a")
+    _capture(tmp_path, "ABC-1", "run-b")
+    _capture(tmp_path, "XYZ-2", "run-c")
+    assert (tmp_path / ".index" / "sessions_index.json").exists()
+
+    assert [s["run_id"] for s in list_sessions(str(tmp_path))] == ["run-c", "run-b", "run-a"]
+    assert [s["run_id"] for s in list_sessions(str(tmp_path), ticket="ABC-1", limit=1)] == ["run-b"]
+    assert [s["run_id"] for s in list_sessions(str(tmp_path), ticket="ABC-1", run_id_prefix="run-a")] == ["run-a"]
+    assert list_sessions(str(tmp_path), ticket="NOPE-1") == []
+
+
+def test_list_sessions_rebuilds_stale_index(tmp_path: Path) -> None:
+    _capture(tmp_path, "ABC-1", "run-a")
+    list_sessions(str(tmp_path))
+    copied = tmp_path / "DEF-3" / "run-z"
+    copied.mkdir(parents=True)
+    (copied / "session_manifest.json").write_text('{"ticket": "DEF-3", "run_id": "run-z", "finished_at": "9"}')
+    assert [s["run_id"] for s in list_sessions(str(tmp_path), ticket="DEF-3")] == ["run-z"]
+
+
+def test_events_are_buffered_until_session_error(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(session_capture, "_FLUSH_INTERVAL_S", 3600)
+    cfg = SessionCaptureConfig(enabled=True, output_dir=str(tmp_path), include_env=False)
+    events_path = tmp_path / "ABC-1" / "run-a" / "session_events.jsonl"
+    try:
+        with SessionCapture(cfg, ticket="ABC-1", run_id="run-a") as cap:
+            cap.event("step_started")
+            assert events_path.read_bytes() == b""
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    names = [line.split(b'"event":"')[1].split(b'"')[0] for line in events_path.read_bytes().splitlines()]
+    assert names == [b"session_started", b"step_started", b"session_error", b"session_finished"]
+
+
+def test_event_writer_drops_oldest_non_lifecycle_events(monkeypatch) -> None:
+    monkeypatch.setattr(session_capture, "_QUEUE_MAX", 3)
+    writer = session_capture._EventWriter(None, None)  # type: ignore[arg-type]  # thread never started
+    for name in ["session_started", "a", "b", "c"]:
+        writer.put({"event": name})
+    assert [e["event"] for e in writer._pending] == ["session_started", "b", "c"]
+
+
+def test_redaction_matcher_is_case_insensitive_and_recursive() -> None:
+    is_secret = session_capture._build_key_matcher(["token", "api_key"])
+    data = {"JIRA_TOKEN": "x", "nested": {"Api_Key": "y", "ok": 1}, "items": [{"token": "z"}], "repo": "r"}
+    assert session_capture._redact_dict(data, is_secret) == {
+        "JIRA_TOKEN": "***REDACTED***",
+        "nested": {"Api_Key": "***REDACTED***", "ok": 1},
+        "items": [{"token": "***REDACTED***"}],
+        "repo": "r",
+    }
+    assert not session_capture._build_key_matcher([])("token")
+
+
+def test_redact_dict_returns_clean_subtrees_uncopied() -> None:
+    is_secret = session_capture._build_key_matcher(["token"])
+    clean = {"a": {"b": [1, {"c": 2}]}}
+    assert session_capture._redact_dict(clean, is_secret) is clean
+    mixed = {"keep": {"x": 1}, "deep": {"token": "t"}}
+    out = session_capture._redact_dict(mixed, is_secret)
+    assert out is not mixed and out["keep"] is mixed["keep"]
+    assert mixed["deep"] == {"token": "t"}
+
+
+def test_tee_output_is_captured_as_utf8(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(session_capture, "_FLUSH_INTERVAL_S", 3600)
+    cfg = SessionCaptureConfig(enabled=True, output_dir=str(tmp_path), include_env=False)
+    with SessionCapture(cfg, ticket="ABC-1", run_id="run-a") as cap:
+        print("héllo", end="")
+        print(" wörld")
+        assert (cap.session_dir / "session_output.log").read_bytes() == b""
+    assert session_capture.read_session_output(tmp_path / "ABC-1" / "run-a") == "héllo wörld\n"
+
+
+def test_snapshot_config_is_redacted(tmp_path: Path) -> None:
+    cfg = SessionCaptureConfig(enabled=True, output_dir=str(tmp_path), include_env=False)
+    with SessionCapture(cfg, ticket="ABC-1", run_id="run-a") as cap:
+        cap.snapshot_config({"jira": {"api_token": "s3cret", "base_url": "https://jira"}})
+    events = session_capture.read_session_events(tmp_path / "ABC-1" / "run-a")
+    snapshot = next(e["data"] for e in events if e["event"] == "config_snapshot")
+    assert snapshot["jira"]["base_url"] == "https://jira"
+    assert snapshot["jira"]["api_token"] != "s3cret"
+
+
+def test_empty_redact_patterns_skip_redaction(tmp_path: Path) -> None:
+    cfg = SessionCaptureConfig(enabled=True, output_dir=str(tmp_path), include_env=False, redact_patterns=[])
+    cap = SessionCapture(cfg, ticket="ABC-1", run_id="run-a")
+    data = {"api_token": "visible", "nested": {"password": "x"}}
+    assert cap._redact(data) is data
+
+
+def test_prune_old_sessions_removes_expired_and_empty_ticket_dirs(tmp_path: Path) -> None:
+    _capture(tmp_path, "ABC-1", "run-old")
+    _capture(tmp_path, "XYZ-2", "run-new")
+    old_manifest = tmp_path / "ABC-1" / "run-old" / "session_manifest.json"
+    os.utime(old_manifest, (0, 0))
+
+    session_capture._prune_old_sessions(tmp_path, retention_days=1)
+    assert not (tmp_path / "ABC-1").exists()
+    assert (tmp_path / "XYZ-2" / "run-new").exists()
+    assert (tmp_path / ".index").exists()
+
+
+def test_manifest_counts_event_names(tmp_path: Path) -> None:
+    _capture(tmp_path, "ABC-1", "run-a")
+    manifest = session_capture.json_loads((tmp_path / "ABC-1" / "run-a" / "session_manifest.json").read_bytes())
+    assert manifest["event_name_counts"] == {"session_started": 1, "run_initiated": 1, "session_finished": 1}
+    assert "event_names" not in manifest
+
+
+def test_concurrent_index_updates_keep_every_ticket(tmp_path: Path) -> None:
+    import multiprocessing
+
+    _capture(tmp_path, "SEED-0", "run-0")
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_capture, args=(tmp_path, f"T-{i}", f"run-{i}")) for i in range(6)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+
+    index = session_capture.json_loads((tmp_path / ".index" / "sessions_index.json").read_bytes())["tickets"]
+    assert all(index.get(f"T-{i}") for i in range(6))
@@ -14,3 +14,78 @@ def test_ticket_idempotency(tmp_path: Path, monkeypatch) -> None:
     fetched = state.get_ticket("ABC-1")
     assert fetched is not None
     assert fetched.pr_url == "http://pr"
+
+
+def test_dump_table_iter_selects_columns(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(state, "DB_PATH", tmp_path / "state.sqlite")
+    state.init_db()
+    state.set_lock("repo", "run1")
+
+    rows = list(state.dump_table_iter("locks", ["repo", "run_id"]))
+    assert rows == [{"repo": "repo", "run_id": "run1"}]
+    assert state.dump_table("locks")[0]["locked_at"]
+
+
+def test_try_acquire_lock_is_exclusive_until_expired(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(state, "DB_PATH", tmp_path / "state.sqlite")
+    state.init_db()
+
+    assert state.try_acquire_lock("repo", "run1")
+    assert state.try_acquire_lock("repo", "run1")
+    assert not state.try_acquire_lock("repo", "run2")
+
+    state.clear_lock("repo", "run2")
+    assert state.get_lock("repo") == "run1"
+
+    conn = state._connect()
+    conn.execute("UPDATE locks SET locked_at = datetime('now', '-2 hours')")
+    conn.commit()
+    conn.close()
+    assert state.try_acquire_lock("repo", "run2", ttl_seconds=3600)
+    assert state.get_lock("repo") == "run2"
+
+
+def test_transaction_commits_together_or_not_at_all(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(state, "DB_PATH", tmp_path / "state.sqlite")
+    state.init_db()
+
+    with state.transaction():
+        state.upsert_ticket(state.TicketState("ABC-1", "PR_OPENED", "repo", "b", "http://pr", "run1", None))
+        state.set_lock("repo", "run1")
+    assert state.get_ticket("ABC-1") is not None
+    assert state.get_lock("repo") == "run1"
+
+    try:
+        with state.transaction():
+            state.clear_lock("repo", "run1")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert state.get_lock("repo") == "run1"
+
+
+def test_connection_is_reused_per_thread_and_uses_wal(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(state, "DB_PATH", tmp_path / "state.sqlite")
+    state.init_db()
+
+    conn = state._connection()
+    assert state._connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    monkeypatch.setattr(state, "DB_PATH", tmp_path / "other.sqlite")
+    assert state._connection() is not conn
+    state._close_all()
+    assert state._OPEN == []
+
+
+def test_bulk_writes_insert_every_row(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(state, "DB_PATH", tmp_path / "state.sqlite")
+    state.init_db()
+
+    state.add_runs([state.RunState(f"run{i}", f"ABC-{i}", "RUNNING", "repo", None, None, None, None) for i in range(3)])
+    state.upsert_tickets([state.TicketState(f"ABC-{i}", "RUNNING", "repo", None, None, f"run{i}", None) for i in range(3)])
+    state.upsert_tickets([state.TicketState("ABC-1", "PR_OPENED", "repo", "b", "http://pr", "run1", None)])
+
+    assert len(state.dump_table("runs")) == 3
+    assert len(state.dump_table("tickets")) == 3
+    assert state.get_ticket("ABC-1").status == "PR_OPENED"
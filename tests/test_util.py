@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from j2pr import util
+from j2pr.util import run_command, run_command_to_file
+
+
+def test_run_command_to_file_streams_merged_output(tmp_path: Path) -> None:
+    log_path = tmp_path / "test_output.log"
+    code = run_command_to_file(
+        [sys.executable, "-c", "import sys; print('out'); sys.stdout.flush(); print('err', file=sys.stderr); sys.exit(3)"],
+        log_path,
+        cwd=tmp_path,
+    )
+    assert code == 3
+    assert log_path.read_text().split() == ["out", "err"]
+
+
+def test_run_command_decodes_output_on_access() -> None:
+    result = run_command([sys.executable, "-c", "import sys; sys.stdout.buffer.write(b'caf\\xc3\\xa9 \\xff')"])
+    assert result.stdout_bytes == b"caf\xc3\xa9 \xff"
+    assert result.stdout == "café �"
+    assert result.stderr == ""
+
+
+@pytest.mark.parametrize("backend", ["default", "stdlib"])
+def test_json_bytes_escapes_lone_surrogates(backend: str, monkeypatch) -> None:
+    if backend == "stdlib":
+        monkeypatch.setattr(util, "orjson", None)
+    data = {"path": "/tmp/caf\udcff", "ok": "é"}
+    encoded = util.json_bytes(data)
+    assert b"\\udcff" in encoded
+    assert util.json_loads(encoded) == data